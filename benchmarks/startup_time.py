@@ -0,0 +1,70 @@
+"""
+Measure cold import time of entry-point modules.
+
+Each measurement runs in a fresh interpreter, matching the cost paid by every
+worker of a spawn-based process pool. Run from the project root:
+
+    uv run python benchmarks/startup_time.py --repeats 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = (
+    "src.simulation.counters",
+    "src.simulation.montecarlo",
+    "src.simulation.common_random",
+    "main",
+    "last_run_report",
+)
+
+HEAVY_MODULES = ("pandas", "matplotlib", "scipy")
+
+
+def measure_import(module: str, repeats: int) -> tuple[float, list[str]]:
+    """Return the median wall time (seconds) to import `module` and heavy deps it loads."""
+    probe = (
+        f"import sys; import {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    timings: list[float] = []
+    loaded = ""
+    for _ in range(repeats):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+        loaded = completed.stdout.strip()
+    return statistics.median(timings), [name for name in loaded.split(",") if name]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES))
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline, _ = measure_import("sys", args.repeats)
+    print(f"{'module':<32} {'startup (ms)':>12} {'import (ms)':>12}  heavy deps")
+    print(f"{'(interpreter)':<32} {baseline * 1000:>12.1f} {0:>12.1f}")
+    for module in args.modules:
+        elapsed, loaded = measure_import(module, args.repeats)
+        print(
+            f"{module:<32} {elapsed * 1000:>12.1f} "
+            f"{(elapsed - baseline) * 1000:>12.1f}  {', '.join(loaded) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
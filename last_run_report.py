@@ -3,7 +3,6 @@ from __future__ import annotations
 from datetime import datetime
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import pandas as pd
 
 
@@ -70,6 +69,11 @@ def _build_stats(df: pd.DataFrame) -> dict[str, float | int | None]:
 
 
 def _save_visuals(df: pd.DataFrame, assets_dir: Path) -> dict[str, str]:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     assets_dir.mkdir(parents=True, exist_ok=True)
     paths: dict[str, str] = {}
 
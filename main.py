@@ -1,7 +1,13 @@
-import matplotlib.pyplot as plt
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 
 from src.simulation.config_loader import generate_parameter_combinations, load_config
 from src.simulation.montecarlo import build_counter_data, run_simulation
+from src.simulation.parameters import compile_parameters
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def main(plot: bool = True) -> None:
@@ -13,32 +19,42 @@ def main(plot: bool = True) -> None:
         print("No parameter combinations were generated.")
         return
 
-    simulation_df = run_simulation(counter_df, parameter_sets[0], export_csv=True)
+    params = compile_parameters(parameter_sets[0])
+    simulation_df = run_simulation(counter_df, params, export_csv=True)
     completed_df = simulation_df[simulation_df["completion"] == True].copy()
 
     if completed_df.empty:
         print("No completed work orders found for the selected parameter set.")
         return
 
-    completed_df["cumsum_package_cycle"] = completed_df["package_cycle"].cumsum()
+    completed_df["cumsum_package_cycle"] = [
+        params.package_cycle * count for count in range(1, len(completed_df) + 1)
+    ]
 
     if plot:
-        plt.figure(figsize=(10, 6))
-        plt.plot(
-            completed_df["call_number"],
-            completed_df["next_planned_counter"],
-            marker="o",
-        )
-        plt.plot(
-            completed_df["call_number"],
-            completed_df["cumsum_package_cycle"],
-            marker="x",
-        )
-        plt.xlabel("Call Number")
-        plt.ylabel("Next Planned Counter")
-        plt.title("Next Planned Counter vs Call Number")
-        plt.grid()
-        plt.show()
+        plot_completed_work_orders(completed_df)
+
+
+def plot_completed_work_orders(completed_df: pd.DataFrame) -> None:
+    """Plot planned counters of completed work orders (imports matplotlib lazily)."""
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    plt.plot(
+        completed_df["call_number"],
+        completed_df["next_planned_counter"],
+        marker="o",
+    )
+    plt.plot(
+        completed_df["call_number"],
+        completed_df["cumsum_package_cycle"],
+        marker="x",
+    )
+    plt.xlabel("Call Number")
+    plt.ylabel("Next Planned Counter")
+    plt.title("Next Planned Counter vs Call Number")
+    plt.grid()
+    plt.show()
 
 
 if __name__ == "__main__":
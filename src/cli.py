@@ -0,0 +1,156 @@
+"""
+Headless batch runner.
+
+Usage (from the project root):
+
+    uv run python -m src.cli --config config.json --output-dir output --sweep
+"""
+
+import argparse
+import sys
+
+from src.simulation.backends import BACKENDS
+from src.simulation.config_loader import load_config
+from src.simulation.runner import MemoryBudgetError, plan_batch, run_batch
+from src.simulation.sinks import SINK_FORMATS
+from src.utils.combinatorics import SAMPLING_METHODS
+from src.utils.resources import parse_bytes
+
+
+def _positive_int(value: str) -> int:
+    parsed = int(value)
+    if parsed < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return parsed
+
+
+def _size(value: str) -> int:
+    try:
+        return parse_bytes(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Run maintenance-plan simulations headlessly.",
+    )
+    parser.add_argument("--config", default="config.json", help="config JSON path")
+    parser.add_argument(
+        "--output-dir", default="output", help="directory for results (default: output)"
+    )
+    parser.add_argument("--seed", type=int, help="seed for utilisation and sampling")
+    parser.add_argument(
+        "--workers", type=_positive_int, default=1, help="worker processes (default: 1)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default="reference",
+        help="simulation engine (default: reference)",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=_size,
+        help="fit workers and chunk size to this size and stop when a process "
+        "exceeds its share, e.g. 4G or 512M",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=_positive_int,
+        help="simulations per result chunk (default: all at once)",
+    )
+    parser.add_argument(
+        "--sink",
+        choices=SINK_FORMATS,
+        default="csv",
+        help="result format (default: csv)",
+    )
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument(
+        "--sweep", action="store_true", help="run every parameter combination"
+    )
+    selection.add_argument(
+        "--sample",
+        type=_positive_int,
+        metavar="N",
+        help="run N combinations sampled from the parameter grid",
+    )
+    parser.add_argument(
+        "--sample-method",
+        choices=SAMPLING_METHODS,
+        default="random",
+        help="sampling strategy for --sample (default: random)",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="float32 counters and compact result dtypes (about half the size)",
+    )
+    parser.add_argument(
+        "--estimate",
+        action="store_true",
+        help="print the memory estimate and chosen plan, then exit without running",
+    )
+    parser.add_argument(
+        "--trace-allocations",
+        action="store_true",
+        help="also report tracemalloc peaks per phase (slower)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip parameter sets already completed in --output-dir (needs the same "
+        "--seed, config and selection as the run being resumed)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    try:
+        config = load_config(args.config)
+        if args.estimate:
+            plan = plan_batch(
+                config,
+                seed=args.seed,
+                workers=args.workers,
+                backend=args.backend,
+                sink_format=args.sink,
+                sweep=args.sweep,
+                sample=args.sample,
+                sample_method=args.sample_method,
+                chunk_size=args.chunk_size,
+                memory_budget=args.memory_budget,
+                compact=args.compact,
+            )
+            print(plan.summary())
+            return 0
+        stats = run_batch(
+            config,
+            args.output_dir,
+            seed=args.seed,
+            workers=args.workers,
+            backend=args.backend,
+            sink_format=args.sink,
+            sweep=args.sweep,
+            sample=args.sample,
+            sample_method=args.sample_method,
+            resume=args.resume,
+            chunk_size=args.chunk_size,
+            memory_budget=args.memory_budget,
+            compact=args.compact,
+            trace_allocations=args.trace_allocations,
+        )
+    except (OSError, ValueError, MemoryBudgetError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    print(stats.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
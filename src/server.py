@@ -0,0 +1,170 @@
+"""
+Local simulation service.
+
+Usage (from the project root):
+
+    uv run python -m src.server --workers 4 --port 8765
+
+Endpoints (JSON over HTTP, no external broker):
+
+    POST /jobs               {"config": {...} | "config_path": "...", "kind": "run" | "sweep",
+                              "seed": 1, "sample": N, "sample_method": "random"}
+    GET  /jobs               status of every job
+    GET  /jobs/<id>          status and partial aggregates
+    GET  /jobs/<id>/stream   newline-delimited JSON snapshots until the job finishes
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any
+
+from src.simulation.backends import BACKENDS
+from src.simulation.config_loader import load_config
+from src.simulation.service import Job, SimulationService
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found"}
+
+
+def _positive_int(value: str) -> int:
+    parsed = int(value)
+    if parsed < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return parsed
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> tuple[str, str, dict[str, Any]]:
+    request_line = (await reader.readline()).decode("latin-1").split()
+    if len(request_line) != 3:
+        raise ValueError("Malformed request line.")
+    method, target, _ = request_line
+    headers: dict[str, str] = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    body = json.loads(await reader.readexactly(length)) if length else {}
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object.")
+    return method, target, body
+
+
+def _write_head(writer: asyncio.StreamWriter, status: int, content_type: str) -> None:
+    writer.write(
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        f"Content-Type: {content_type}\r\nConnection: close\r\n\r\n".encode("latin-1")
+    )
+
+
+def _write_json(writer: asyncio.StreamWriter, status: int, payload: Any) -> None:
+    _write_head(writer, status, "application/json")
+    writer.write(json.dumps(payload).encode("utf-8"))
+
+
+def submit_job(service: SimulationService, body: dict[str, Any]) -> Job:
+    """Validate a POST /jobs body and submit it to `service`."""
+    if ("config" in body) == ("config_path" in body):
+        raise ValueError("Provide exactly one of 'config' or 'config_path'.")
+    if "config_path" in body and not isinstance(body["config_path"], str):
+        raise ValueError("'config_path' must be a string.")
+    config = body["config"] if "config" in body else load_config(body["config_path"])
+    return service.submit(
+        config,
+        kind=body.get("kind", "run"),
+        seed=body.get("seed"),
+        sample=body.get("sample"),
+        sample_method=body.get("sample_method", "random"),
+    )
+
+
+async def handle_connection(
+    service: SimulationService,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    try:
+        try:
+            method, target, body = await _read_request(reader)
+            parts = [part for part in target.split("?")[0].split("/") if part]
+            if method == "POST" and parts == ["jobs"]:
+                _write_json(writer, 202, submit_job(service, body).snapshot())
+            elif method == "GET" and parts == ["jobs"]:
+                _write_json(
+                    writer, 200, [job.snapshot() for job in service.jobs.values()]
+                )
+            elif method == "GET" and len(parts) == 2 and parts[0] == "jobs":
+                _write_json(writer, 200, service.get(parts[1]).snapshot())
+            elif (
+                method == "GET" and len(parts) == 3 and parts[::2] == ["jobs", "stream"]
+            ):
+                service.get(parts[1])
+                _write_head(writer, 200, "application/x-ndjson")
+                async for snapshot in service.watch(parts[1]):
+                    writer.write(json.dumps(snapshot).encode("utf-8") + b"\n")
+                    await writer.drain()
+            else:
+                _write_json(writer, 404, {"error": f"No route for {method} {target}"})
+        except (OSError, ValueError) as exc:
+            status = 404 if str(exc).startswith("Unknown job") else 400
+            _write_json(writer, status, {"error": str(exc)})
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(
+    host: str, port: int, workers: int, backend: str, chunk_size: int | None
+) -> None:
+    async with SimulationService(workers, backend, chunk_size) as service:
+        server = await asyncio.start_server(
+            lambda reader, writer: handle_connection(service, reader, writer),
+            host,
+            port,
+        )
+        print(
+            f"Serving on http://{host}:{port} with {workers} warm worker(s)",
+            flush=True,
+        )
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.server",
+        description="Run a local simulation job service.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="bind address")
+    parser.add_argument("--port", type=int, default=8765, help="port (default: 8765)")
+    parser.add_argument(
+        "--workers", type=_positive_int, default=1, help="worker processes (default: 1)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default="batched",
+        help="simulation engine (default: batched)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=_positive_int,
+        help="simulations per task (default: spread each set across the workers)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(
+            serve(args.host, args.port, args.workers, args.backend, args.chunk_size)
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from .fleet import run_batched_simulation
+from .parameters import ParameterSet
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+Backend = Callable[["pd.DataFrame", ParameterSet], "pd.DataFrame"]
+
+
+def _reference_backend(counter_df: pd.DataFrame, params: ParameterSet) -> pd.DataFrame:
+    from .montecarlo import run_simulation
+
+    return run_simulation(counter_df, params, export_csv=False)
+
+
+BACKENDS: dict[str, Backend] = {
+    "reference": _reference_backend,
+    "batched": run_batched_simulation,
+}
+
+
+def get_backend(name: str) -> Backend:
+    """Return the simulation backend registered under `name`."""
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown backend: {name} (available: {', '.join(sorted(BACKENDS))})"
+        ) from None
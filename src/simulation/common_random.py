@@ -0,0 +1,197 @@
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .counters import load_counter_arrays, save_counter_arrays
+from .montecarlo import counter_frame, run_simulation
+from .parameters import ParameterSet, compile_parameters
+from .results import KPI_COLUMNS, simulation_kpis
+
+COUNTER_COLUMNS = ["utilisation", "cumulative_utilisation"]
+
+_shared_counter_df: pd.DataFrame | None = None
+
+
+def _stacked_counters(counter_df: pd.DataFrame) -> np.ndarray:
+    simulations = counter_df.index.get_level_values("simulation").unique()
+    days = counter_df.index.get_level_values("day").unique()
+    if len(counter_df) != len(simulations) * len(days):
+        raise ValueError("Counter data must cover every simulation/day pair.")
+
+    dtype = np.result_type(*counter_df[COUNTER_COLUMNS].dtypes)
+    return (
+        counter_df[COUNTER_COLUMNS]
+        .to_numpy(dtype=dtype)
+        .T.reshape(len(COUNTER_COLUMNS), len(simulations), len(days))
+    )
+
+
+def save_counter_data(counter_df: pd.DataFrame, path: str | Path) -> Path:
+    """
+    Persist counter data as a `.npy` array of shape (2, num_simulations, num_days).
+
+    The counter dtype is kept, so compact (float32) counters stay compact.
+
+    The file can be memory-mapped read-only by `load_counter_data`, so every
+    process in a sweep shares the same utilisation paths without copying them.
+    """
+    return save_counter_arrays(_stacked_counters(counter_df), path)
+
+
+def load_counter_data(path: str | Path) -> pd.DataFrame:
+    """
+    Load counter data saved by `save_counter_data` as a read-only memory map.
+
+    The returned DataFrame is a zero-copy view over the file.
+    """
+    return counter_frame(load_counter_arrays(path))
+
+
+def _check_counter_file(counter_df: pd.DataFrame, path: str | Path) -> None:
+    expected = _stacked_counters(counter_df)
+    stored = load_counter_arrays(path)
+    if (
+        stored.shape != expected.shape
+        or stored.dtype != expected.dtype
+        or not np.array_equal(stored, expected, equal_nan=True)
+    ):
+        raise ValueError(
+            f"Counter file {path} holds different counter data "
+            f"(shape {stored.shape}, {stored.dtype}) than counter_df "
+            f"(shape {expected.shape}, {expected.dtype}); remove it or pass "
+            "another counter_path."
+        )
+
+
+def _init_worker(counter_path: str) -> None:
+    global _shared_counter_df
+    _shared_counter_df = load_counter_data(counter_path)
+
+
+def _run_parameter_set(
+    index: int,
+    parameter_config: ParameterSet,
+    counter_df: pd.DataFrame | None = None,
+) -> tuple[int, pd.DataFrame]:
+    if counter_df is None:
+        counter_df = _shared_counter_df
+    result_df = run_simulation(counter_df, parameter_config, export_csv=False)
+    return index, simulation_kpis(result_df)
+
+
+def run_common_random_sweep(
+    counter_df: pd.DataFrame,
+    parameter_sets: list[dict[str, Any]],
+    workers: int = 1,
+    counter_path: str | Path | None = None,
+) -> pd.DataFrame:
+    """
+    Run every parameter set against the same counter data.
+
+    Using common random numbers means each parameter set sees identical
+    utilisation paths, so per-simulation KPIs can be compared pairwise.
+    When `counter_path` is given, the counters are persisted there with
+    `save_counter_data`, and every parameter set reads them as a read-only
+    memory map, whatever the worker count. An existing file is reused only
+    if it holds exactly `counter_df` (same shape, dtype and values);
+    otherwise `ValueError` is raised before anything runs. With `workers > 1` and no
+    `counter_path`, a temporary file is shared by the workers instead.
+
+    Returns per-simulation KPIs indexed by (`parameter_set`, `simulation`).
+    """
+    compiled = [compile_parameters(parameter_set) for parameter_set in parameter_sets]
+    if counter_path is not None:
+        if Path(counter_path).exists():
+            _check_counter_file(counter_df, counter_path)
+        else:
+            save_counter_data(counter_df, counter_path)
+    results: dict[int, pd.DataFrame] = {}
+    if workers <= 1:
+        if counter_path is not None:
+            counter_df = load_counter_data(counter_path)
+        for index, parameter_config in enumerate(compiled):
+            _, results[index] = _run_parameter_set(index, parameter_config, counter_df)
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            if counter_path is None:
+                counter_path = save_counter_data(
+                    counter_df, Path(temp_dir) / "counter_data.npy"
+                )
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(str(counter_path),),
+            ) as executor:
+                futures = [
+                    executor.submit(_run_parameter_set, index, parameter_config)
+                    for index, parameter_config in enumerate(compiled)
+                ]
+                for future in futures:
+                    index, kpis = future.result()
+                    results[index] = kpis
+
+    if not results:
+        return pd.DataFrame(columns=list(KPI_COLUMNS))
+    return pd.concat(results, names=["parameter_set"])
+
+
+def paired_differences(
+    kpis: pd.DataFrame,
+    baseline: int = 0,
+    confidence: float = 0.95,
+) -> pd.DataFrame:
+    """
+    Compare each parameter set against `baseline` using paired differences.
+
+    Differences are taken per simulation (`set - baseline`), which removes
+    the shared utilisation noise from the comparison. Returns one row per
+    (`parameter_set`, `kpi`) with the mean difference, its standard error and
+    a Student-t confidence interval.
+    """
+    from scipy import stats
+
+    baseline_kpis = kpis.xs(baseline, level="parameter_set")
+    rows: list[dict[str, Any]] = []
+    for parameter_set in kpis.index.get_level_values("parameter_set").unique():
+        if parameter_set == baseline:
+            continue
+        set_kpis = kpis.xs(parameter_set, level="parameter_set")
+        for kpi in KPI_COLUMNS:
+            diff = (
+                set_kpis[kpi].astype(float) - baseline_kpis[kpi].astype(float)
+            ).dropna()
+            n = len(diff)
+            mean = float(diff.mean()) if n else float("nan")
+            std_error = float(diff.std(ddof=1) / np.sqrt(n)) if n > 1 else float("nan")
+            margin = (
+                float(stats.t.ppf((1 + confidence) / 2, n - 1)) * std_error
+                if n > 1
+                else float("nan")
+            )
+            rows.append(
+                {
+                    "parameter_set": parameter_set,
+                    "kpi": kpi,
+                    "n": n,
+                    "mean_difference": mean,
+                    "std_error": std_error,
+                    "ci_low": mean - margin,
+                    "ci_high": mean + margin,
+                }
+            )
+    columns = [
+        "parameter_set",
+        "kpi",
+        "n",
+        "mean_difference",
+        "std_error",
+        "ci_low",
+        "ci_high",
+    ]
+    return pd.DataFrame.from_records(rows, columns=columns).set_index(
+        ["parameter_set", "kpi"]
+    )
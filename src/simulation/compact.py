@@ -0,0 +1,92 @@
+"""
+Compact storage dtypes for counter data and work-order results.
+
+Precision guarantees:
+
+- Counters are generated and accumulated in float64, then stored as float32.
+  Each stored value is the nearest float32, so its relative error is at most
+  2**-24 (about 6e-8). Two-decimal values (daily utilisation, and cumulative
+  counters below 131,072 units) round back exactly with `round(x, 2)`.
+- Work-order counters and estimates are stored as float32 with the same
+  relative error bound; day and call-number columns are exact (nullable Int32).
+- Simulations run on float32 counters see counters within that bound. A call
+  or completion can move by a day only when a counter lands within ~6e-8
+  (relative) of a call threshold, so per-run KPIs can differ slightly while
+  aggregate KPIs stay within sampling noise (see tests/test_compact.py).
+
+pandas is imported by the frame conversions only, so `COMPACT_COUNTER_DTYPE`
+is cheap to import for array-only runs.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .fleet import WORK_ORDER_COLUMNS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+COMPACT_COUNTER_DTYPE = np.float32
+
+FLAG_COLUMNS = ("called", "completion", "open_work_orders")
+INTEGER_COLUMNS = (
+    "call_number",
+    "planned_day",
+    "call_day",
+    "work_order_number",
+    "completion_day",
+    "next_call_number",
+    "last_completed_call_number",
+    "simulation",
+)
+CATEGORY_COLUMNS = ("item", "asset")
+
+
+def compact_counter_data(counter_df: pd.DataFrame) -> pd.DataFrame:
+    """Return counter data with float32 columns (same index)."""
+    return counter_df.astype(COMPACT_COUNTER_DTYPE)
+
+
+def compact_work_orders(work_order_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a work-order frame for storage.
+
+    Counters become float32, day and call-number columns nullable Int32,
+    `item`/`asset` categoricals, and the boolean flag columns are packed into
+    one uint8 `flags` column (bit i set for `FLAG_COLUMNS[i]`).
+    """
+    import pandas as pd
+
+    columns: dict[str, object] = {}
+    flags = np.zeros(len(work_order_df), dtype=np.uint8)
+    for column in work_order_df.columns:
+        values = work_order_df[column]
+        if column in FLAG_COLUMNS:
+            flags |= values.to_numpy(dtype=bool).astype(np.uint8) << np.uint8(
+                FLAG_COLUMNS.index(column)
+            )
+        elif column in INTEGER_COLUMNS:
+            columns[column] = pd.to_numeric(values).astype("Int32")
+        elif column in CATEGORY_COLUMNS:
+            columns[column] = values.astype("category")
+        elif pd.api.types.is_numeric_dtype(values):
+            columns[column] = values.astype(np.float32)
+        else:
+            columns[column] = values
+    columns["flags"] = flags
+    return pd.DataFrame(columns, index=work_order_df.index)
+
+
+def expand_work_orders(compact_df: pd.DataFrame) -> pd.DataFrame:
+    """Restore the flag columns of a `compact_work_orders` frame as booleans."""
+    flags = compact_df["flags"].to_numpy(dtype=np.uint8)
+    expanded = compact_df.drop(columns="flags")
+    for bit, column in enumerate(FLAG_COLUMNS):
+        expanded[column] = (flags >> bit) & 1 == 1
+    order = [column for column in WORK_ORDER_COLUMNS if column in expanded.columns]
+    return expanded[
+        order + [column for column in expanded.columns if column not in order]
+    ]
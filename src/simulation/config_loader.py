@@ -1,6 +1,6 @@
 from typing import Any
 
-from src.utils.combinatorics import generate_dict_cartesian_product
+from src.utils.combinatorics import ParameterGrid, generate_dict_cartesian_product
 from src.utils.json_io import load_json_file
 
 
@@ -15,3 +15,13 @@ def generate_parameter_combinations(parameters: dict[str, Any]) -> list[dict[str
     Returns a list of dicts.
     """
     return generate_dict_cartesian_product(parameters)
+
+
+def generate_parameter_grid(parameters: dict[str, Any]) -> ParameterGrid:
+    """
+    Build a lazy grid over the parameter combinations.
+
+    Supports `len()`, indexing by combination id and subsampling, without
+    materialising every combination.
+    """
+    return ParameterGrid(parameters)
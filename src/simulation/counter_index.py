@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+NO_DAY = -1
+
+
+@dataclass(frozen=True)
+class CounterIndex:
+    """
+    Answer "on which day does the cumulative counter first exceed X?" in batches.
+
+    Built on the (num_lanes, num_days) cumulative counters from
+    `build_counter_arrays` (or `build_counter_data`, one lane per simulation).
+    Queries bisect every (lane, threshold) pair at once, so a batch costs
+    O(log num_days) array operations whatever the number of lanes.
+    Only needs numpy, like `src/simulation/counters.py`. `simulations` holds
+    the simulation id of each lane (None means lane `i` is simulation `i`).
+    """
+
+    running_max: np.ndarray
+    simulations: np.ndarray | None = None
+
+    @classmethod
+    def from_cumulative(
+        cls, cumulative: np.ndarray, simulations: np.ndarray | None = None
+    ) -> "CounterIndex":
+        """
+        Index a (num_lanes, num_days) cumulative array (1-D means one lane).
+
+        Cumulative utilisation is monotone unless a phase can draw negative
+        values; the index then searches the running maximum, whose first
+        crossing is the same day. Monotone input is used without a copy, so
+        memory-mapped counters stay mapped. `simulations` are the lanes'
+        simulation ids, e.g. `np.arange(start, stop)` for a chunk.
+        """
+        cumulative = np.asarray(cumulative)
+        if cumulative.ndim == 1:
+            cumulative = cumulative[None, :]
+        if cumulative.ndim != 2:
+            raise ValueError("cumulative must be shaped (num_lanes, num_days).")
+        if not (cumulative[:, 1:] >= cumulative[:, :-1]).all():
+            cumulative = np.maximum.accumulate(cumulative, axis=1)
+        if simulations is not None:
+            simulations = np.asarray(simulations, dtype=np.int64)
+            if simulations.shape != (cumulative.shape[0],):
+                raise ValueError("simulations need one id per lane.")
+        return cls(cumulative, simulations)
+
+    @classmethod
+    def from_counter_data(cls, counter_df: Any) -> "CounterIndex":
+        """
+        Index `build_counter_data` output, one lane per simulation.
+
+        Lanes keep the frame's simulation ids, so chunks (e.g.
+        `counter_frame(chunk, start)`) need not start at simulation 0.
+        """
+        simulations = counter_df.index.get_level_values("simulation").unique()
+        cumulative = counter_df["cumulative_utilisation"].to_numpy()
+        return cls.from_cumulative(
+            cumulative.reshape(len(simulations), -1), np.asarray(simulations)
+        )
+
+    @property
+    def num_lanes(self) -> int:
+        return self.running_max.shape[0]
+
+    @property
+    def num_days(self) -> int:
+        return self.running_max.shape[1]
+
+    def lanes_of(self, simulations: np.ndarray) -> np.ndarray:
+        """Lane positions of simulation ids; unknown ids raise `ValueError`."""
+        simulations = np.asarray(simulations, dtype=np.int64)
+        labels = (
+            np.arange(self.num_lanes) if self.simulations is None else self.simulations
+        )
+        order = np.argsort(labels, kind="stable")
+        positions = np.searchsorted(labels, simulations, sorter=order)
+        found = positions < labels.size
+        lanes = order[np.where(found, positions, 0)] if labels.size else positions
+        found[found] = labels[lanes[found]] == simulations[found]
+        if not found.all():
+            missing = np.unique(simulations[~found]).tolist()
+            raise ValueError(f"Simulations not in the counter index: {missing}")
+        return lanes
+
+    def first_crossing_days(
+        self,
+        thresholds: np.ndarray | float,
+        lanes: slice | np.ndarray | None = None,
+        start_day: int = 0,
+    ) -> np.ndarray:
+        """
+        First day each lane's cumulative counter is strictly above each threshold.
+
+        `lanes` selects lanes (all when None; indices may repeat). `thresholds`
+        is a scalar, one row `(k,)` shared by every selected lane, or
+        `(num_selected_lanes, k)` per lane. Returns int days shaped
+        `(num_selected_lanes, k)`, with `NO_DAY` where the counter never
+        exceeds the threshold (including NaN thresholds). Days before
+        `start_day` are not searched: a threshold the counter already exceeded
+        by then answers `start_day`.
+        """
+        lane_ids = np.arange(self.num_lanes)[slice(None) if lanes is None else lanes]
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        if thresholds.ndim < 2:
+            thresholds = np.broadcast_to(
+                thresholds.reshape(1, -1), (len(lane_ids), thresholds.size)
+            )
+        if thresholds.shape[0] != len(lane_ids):
+            raise ValueError("thresholds need one row per selected lane.")
+
+        rows = np.broadcast_to(lane_ids[:, None], thresholds.shape).reshape(-1)
+        flat_thresholds = thresholds.reshape(-1)
+        low = np.full(rows.size, min(start_day, self.num_days), dtype=np.int64)
+        high = np.full(rows.size, self.num_days, dtype=np.int64)
+        # The first crossing day lies in [low, high]; high == num_days means
+        # "never". Only unresolved pairs are bisected each step.
+        pending = np.flatnonzero(low < high)
+        while pending.size:
+            middle = (low[pending] + high[pending]) // 2
+            above = self.running_max[rows[pending], middle] > flat_thresholds[pending]
+            high[pending[above]] = middle[above]
+            low[pending[~above]] = middle[~above] + 1
+            pending = pending[low[pending] < high[pending]]
+
+        days = np.where(low == self.num_days, NO_DAY, low)
+        return days.reshape(thresholds.shape)
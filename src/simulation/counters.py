@@ -0,0 +1,100 @@
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .parameters import compile_utilisation_phases
+from .utilisation import generate_utilisation
+
+
+def build_counter_arrays(
+    config: dict[str, Any], rng: np.random.Generator | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Generate utilisation and cumulative counters as arrays.
+
+    Returns `(utilisation, cumulative_utilisation)`, each shaped
+    (num_simulations, num_days). Only needs numpy, so array-based callers and
+    worker processes can build counters without importing pandas. `rng` is
+    passed to `generate_utilisation` (derived from numpy's global state when
+    None).
+    """
+    utilisation = generate_utilisation(
+        config["daily_utilisations"],
+        config["num_simulations"],
+        config["num_days"],
+        rng=rng,
+    )
+    return utilisation, np.cumsum(utilisation, axis=1)
+
+
+def build_fleet_counter_arrays(
+    config: dict[str, Any],
+) -> tuple[tuple[str, ...], np.ndarray, np.ndarray]:
+    """
+    Generate utilisation and cumulative counters for a fleet of assets.
+
+    Assets come from `config["assets"]` (name -> optional per-asset
+    `daily_utilisations`, falling back to the shared phases) or from
+    `config["num_assets"]` assets that all share `daily_utilisations`.
+
+    Returns `(asset_names, utilisation, cumulative_utilisation)` with arrays
+    shaped (num_simulations, num_assets, num_days).
+    """
+    num_simulations = config["num_simulations"]
+    num_days = config["num_days"]
+    shared_phases = config.get("daily_utilisations")
+
+    if "assets" in config:
+        asset_names = tuple(str(name) for name in config["assets"])
+        asset_phases = [
+            (asset_cfg or {}).get("daily_utilisations", shared_phases)
+            for asset_cfg in config["assets"].values()
+        ]
+        for name, phases in zip(asset_names, asset_phases):
+            if phases is None:
+                raise ValueError(f"Asset '{name}' has no daily_utilisations.")
+            compile_utilisation_phases(phases, num_days)
+
+        utilisation = np.empty((num_simulations, len(asset_names), num_days))
+        for position, phases in enumerate(asset_phases):
+            utilisation[:, position, :] = generate_utilisation(
+                phases, num_simulations, num_days
+            )
+    else:
+        num_assets = int(config.get("num_assets", 1))
+        if num_assets < 1:
+            raise ValueError("num_assets must be positive.")
+        asset_names = tuple(f"asset_{position}" for position in range(num_assets))
+        utilisation = generate_utilisation(
+            shared_phases, num_simulations, num_days, num_assets=num_assets
+        )
+
+    return asset_names, utilisation, np.cumsum(utilisation, axis=2)
+
+
+def save_counter_arrays(counters: np.ndarray, path: str | Path) -> Path:
+    """
+    Persist stacked counters shaped (2, num_simulations, num_days) as `.npy`.
+
+    `counters[0]` is utilisation and `counters[1]` the cumulative counter, the
+    layout `save_counter_data` writes from a counter frame. The dtype is kept.
+    """
+    destination = Path(path)
+    stored = np.lib.format.open_memmap(
+        destination, mode="w+", dtype=counters.dtype, shape=counters.shape
+    )
+    stored[:] = counters
+    stored.flush()
+    del stored
+    return destination
+
+
+def load_counter_arrays(path: str | Path) -> np.ndarray:
+    """
+    Memory-map stacked counters saved by `save_counter_arrays` read-only.
+
+    Reads `save_counter_data` files too; unlike `load_counter_data` it does
+    not build a frame, so workers on the array engine skip pandas.
+    """
+    return np.load(path, mmap_mode="r")
@@ -0,0 +1,269 @@
+import hashlib
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .history import (
+    block_bootstrap_history,
+    counter_store_mtime_ns,
+    open_counter_store,
+    replay_history,
+)
+
+Sampler = Callable[[dict[str, Any], np.random.Generator, np.ndarray], None]
+Preparer = Callable[[dict[str, Any]], tuple[tuple[str, Any], ...]]
+Checker = Callable[[dict[str, Any]], None]
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """
+    A registered utilisation distribution.
+
+    `sample(params, rng, out)` fills the contiguous float64 array `out` in
+    place. `keys` are the numeric config keys the distribution needs;
+    `prepare`, when given, replaces the default numeric parsing of a phase
+    config into hashable params. `check`, when given, validates the parsed
+    params when phases are compiled and raises `ValueError` for values the
+    sampler cannot use.
+    """
+
+    keys: tuple[str, ...]
+    sample: Sampler
+    prepare: Preparer | None = None
+    check: Checker | None = None
+
+
+DISTRIBUTIONS: dict[str, Distribution] = {}
+
+
+def register_distribution(
+    name: str,
+    keys: tuple[str, ...] = (),
+    prepare: Preparer | None = None,
+    check: Checker | None = None,
+) -> Callable[[Sampler], Sampler]:
+    """Register `sample` under `name` so phases can use `"distribution": name`."""
+
+    def decorator(sample: Sampler) -> Sampler:
+        DISTRIBUTIONS[name] = Distribution(
+            keys=keys, sample=sample, prepare=prepare, check=check
+        )
+        return sample
+
+    return decorator
+
+
+def get_distribution(name: str) -> Distribution:
+    """Return the registered distribution called `name`."""
+    try:
+        return DISTRIBUTIONS[name]
+    except KeyError:
+        raise ValueError(f"Unsupported distribution: {name}") from None
+
+
+def _non_negative(*keys: str) -> Checker:
+    def check(params: dict[str, Any]) -> None:
+        for key in keys:
+            # `not >=` also rejects NaN
+            if not params[key] >= 0:
+                raise ValueError(f"'{key}' must be >= 0, got {params[key]}.")
+
+    return check
+
+
+def _check_gamma(params: dict[str, Any]) -> None:
+    if not params["shape"] > 0:
+        raise ValueError(f"'shape' must be > 0, got {params['shape']}.")
+    _non_negative("scale")(params)
+
+
+@register_distribution("normal", ("mean", "std"), check=_non_negative("std"))
+def _normal(params: dict[str, Any], rng: np.random.Generator, out: np.ndarray) -> None:
+    rng.standard_normal(out=out)
+    out *= params["std"]
+    out += params["mean"]
+
+
+@register_distribution("uniform", ("min", "max"))
+def _uniform(params: dict[str, Any], rng: np.random.Generator, out: np.ndarray) -> None:
+    rng.random(out=out)
+    out *= params["max"] - params["min"]
+    out += params["min"]
+
+
+@register_distribution("poisson", ("lambda",), check=_non_negative("lambda"))
+def _poisson(params: dict[str, Any], rng: np.random.Generator, out: np.ndarray) -> None:
+    # numpy has no in-place Poisson sampler; the integer draw is copied once
+    out[...] = rng.poisson(params["lambda"], size=out.shape)
+
+
+@register_distribution(
+    "lognormal", ("mean", "sigma"), check=_non_negative("sigma")
+)
+def _lognormal(
+    params: dict[str, Any], rng: np.random.Generator, out: np.ndarray
+) -> None:
+    # `mean` and `sigma` describe the underlying normal, as in numpy
+    _normal({"mean": params["mean"], "std": params["sigma"]}, rng, out)
+    np.exp(out, out=out)
+
+
+@register_distribution("gamma", ("shape", "scale"), check=_check_gamma)
+def _gamma(params: dict[str, Any], rng: np.random.Generator, out: np.ndarray) -> None:
+    rng.standard_gamma(params["shape"], out=out)
+    out *= params["scale"]
+
+
+def _prepare_triangular(phase: dict[str, Any]) -> tuple[tuple[str, Any], ...]:
+    try:
+        left, mode, right = (float(phase[key]) for key in ("left", "mode", "right"))
+    except KeyError as exc:
+        raise ValueError(f"Triangular phases need '{exc.args[0]}'.") from None
+    if not left <= mode <= right or left == right:
+        raise ValueError(
+            "Triangular phases need left <= mode <= right and left < right."
+        )
+    return (("left", left), ("mode", mode), ("right", right))
+
+
+@register_distribution("triangular", prepare=_prepare_triangular)
+def _triangular(
+    params: dict[str, Any], rng: np.random.Generator, out: np.ndarray
+) -> None:
+    left, mode, right = params["left"], params["mode"], params["right"]
+    width = right - left
+    rng.random(out=out)
+    # Inverse CDF, evaluated in place on each side of the mode
+    lower = out < (mode - left) / width
+    upper = ~lower
+    np.multiply(out, width * (mode - left), out=out, where=lower)
+    np.sqrt(out, out=out, where=lower)
+    np.add(out, left, out=out, where=lower)
+    np.subtract(1.0, out, out=out, where=upper)
+    np.multiply(out, width * (right - mode), out=out, where=upper)
+    np.sqrt(out, out=out, where=upper)
+    np.subtract(right, out, out=out, where=upper)
+
+
+def load_samples(path: str | Path) -> np.ndarray:
+    """Load historical daily utilisation from `.npy` or one-value-per-line text/CSV."""
+    source = Path(path)
+    if source.suffix == ".npy":
+        values = np.load(source)
+    else:
+        values = np.loadtxt(source, delimiter=",", ndmin=1)
+    return np.asarray(values, dtype=np.float64).reshape(-1)
+
+
+@dataclass(frozen=True, eq=False)
+class InlineSamples:
+    """
+    Read-only inline empirical samples, hashed and compared by content digest.
+
+    Compiled phases carry these instead of a lookup key, so inline samples
+    live as long as the phase does (file samples are cached per path).
+    """
+
+    digest: str
+    values: np.ndarray = field(repr=False)
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, InlineSamples) and other.digest == self.digest
+
+
+def _empirical_values(values: np.ndarray) -> np.ndarray:
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        raise ValueError("Empirical phases need at least one sample.")
+    values.setflags(write=False)
+    return values
+
+
+@lru_cache(maxsize=16)
+def open_empirical_samples(path: str, mtime_ns: int) -> np.ndarray:
+    """Load (and cache per process) the read-only samples of an empirical file."""
+    return _empirical_values(load_samples(path))
+
+
+def _prepare_empirical(phase: dict[str, Any]) -> tuple[tuple[str, Any], ...]:
+    if ("samples" in phase) == ("path" in phase):
+        raise ValueError("Empirical phases need exactly one of 'samples' or 'path'.")
+    if "path" in phase:
+        path = str(Path(phase["path"]).resolve())
+        try:
+            mtime_ns = Path(path).stat().st_mtime_ns
+        except OSError as exc:
+            raise ValueError(f"Cannot read empirical samples {path}: {exc}") from None
+        # Validate now; sampling reuses the cached array
+        open_empirical_samples(path, mtime_ns)
+        return (("path", path), ("mtime_ns", mtime_ns))
+
+    values = np.asarray(phase["samples"], dtype=np.float64).reshape(-1)
+    digest = hashlib.sha1(values.tobytes()).hexdigest()
+    return (("samples", InlineSamples(digest, _empirical_values(values))),)
+
+
+@register_distribution("empirical", prepare=_prepare_empirical)
+def _empirical(
+    params: dict[str, Any], rng: np.random.Generator, out: np.ndarray
+) -> None:
+    if "path" in params:
+        samples = open_empirical_samples(params["path"], params["mtime_ns"])
+    else:
+        samples = params["samples"].values
+    # Bootstrap: draw historical days with replacement
+    np.take(samples, rng.integers(0, samples.size, size=out.shape), out=out)
+
+
+HISTORY_MODES = ("replay", "block_bootstrap")
+
+
+def _prepare_history(phase: dict[str, Any]) -> tuple[tuple[str, Any], ...]:
+    for key in ("store", "asset"):
+        if key not in phase:
+            raise ValueError(f"History phases need '{key}'.")
+    mode = phase.get("mode", "block_bootstrap")
+    if mode not in HISTORY_MODES:
+        raise ValueError(f"Unsupported history mode: {mode}")
+    block_days = int(phase.get("block_days", 30))
+    offset = int(phase.get("offset", 0))
+    if block_days < 1 or offset < 0:
+        raise ValueError("History phases need block_days >= 1 and offset >= 0.")
+
+    store = str(Path(phase["store"]).resolve())
+    try:
+        mtime_ns = counter_store_mtime_ns(store)
+        history = open_counter_store(store, mtime_ns).asset_history(str(phase["asset"]))
+    except OSError as exc:
+        raise ValueError(f"Cannot open counter store {store}: {exc}") from None
+    if offset >= history.size:
+        raise ValueError(f"History offset {offset} is past the end of the history.")
+    return (
+        ("store", store),
+        ("mtime_ns", mtime_ns),
+        ("asset", str(phase["asset"])),
+        ("mode", mode),
+        ("block_days", block_days),
+        ("offset", offset),
+    )
+
+
+@register_distribution("history", prepare=_prepare_history)
+def _history(params: dict[str, Any], rng: np.random.Generator, out: np.ndarray) -> None:
+    # Reads straight from the memory-mapped store; nothing is copied but `out`
+    store = open_counter_store(params["store"], params["mtime_ns"])
+    history = store.asset_history(params["asset"])
+    if params["mode"] == "replay":
+        replay_history(history, out, params["offset"])
+    else:
+        block_bootstrap_history(
+            history[params["offset"] :], out, rng, params["block_days"]
+        )
@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .counter_index import NO_DAY
+from .counters import build_fleet_counter_arrays
+from .parameters import ParameterSet, compile_parameters
+from .schedule import WorkOrderSchedule, build_schedule
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+WORK_ORDER_COLUMNS = [
+    "item",
+    "cycle",
+    "call_number",
+    "next_planned_counter",
+    "planned_day",
+    "call_day",
+    "work_order_number",
+    "completion_day",
+    "completion_counter",
+    "annual_estimate",
+    "units_prior_for_call",
+    "called",
+    "completion",
+    "call_counter",
+    "last_completion_counter",
+    "last_completion_counter_item",
+    "last_completion_counter_var",
+    "open_work_orders",
+    "next_call_number",
+    "last_completed_call_number",
+]
+
+
+@dataclass
+class BatchedWorkOrders:
+    """
+    Columnar work-order state for many lanes at once.
+
+    A lane is one independent counter path (a simulation, or a simulation of
+    one asset). Per-row arrays are shaped (num_lanes, num_rows), per-lane
+    scalars (num_lanes,), and schedule columns shared by every lane (num_rows,).
+    Unset days hold `NO_DAY`; unset completion counters hold NaN. pandas is
+    only imported by `to_frame`.
+    """
+
+    item_names: tuple[str, ...]
+    item_codes: np.ndarray
+    cycle: np.ndarray
+    call_number: np.ndarray
+    next_planned_counter: np.ndarray
+    call_counter: np.ndarray
+    annual_estimate: np.ndarray
+    units_prior_for_call: np.ndarray
+    called: np.ndarray
+    completion: np.ndarray
+    call_day: np.ndarray
+    planned_day: np.ndarray
+    completion_day: np.ndarray
+    completion_counter: np.ndarray
+    last_completion_counter_item: np.ndarray
+    last_completion_counter: np.ndarray
+    last_completion_counter_var: np.ndarray
+    next_call_number: np.ndarray
+    last_completed_call_number: np.ndarray
+
+    @property
+    def num_lanes(self) -> int:
+        return self.next_planned_counter.shape[0]
+
+    @property
+    def num_rows(self) -> int:
+        return self.next_planned_counter.shape[1]
+
+    @classmethod
+    def from_schedule(
+        cls, schedule: WorkOrderSchedule, num_lanes: int
+    ) -> BatchedWorkOrders:
+        """Broadcast a `build_schedule` result to `num_lanes` lanes."""
+        num_rows = schedule.num_rows
+        item_names = schedule.item_names
+
+        def per_row(values: np.ndarray | float) -> np.ndarray:
+            return np.tile(np.broadcast_to(values, num_rows), (num_lanes, 1))
+
+        return cls(
+            item_names=item_names,
+            item_codes=schedule.item_codes,
+            cycle=schedule.cycle,
+            call_number=schedule.call_number,
+            next_planned_counter=per_row(schedule.next_planned_counter),
+            call_counter=per_row(schedule.call_counter),
+            annual_estimate=per_row(schedule.annual_estimate),
+            units_prior_for_call=per_row(schedule.units_prior_for_call),
+            called=np.zeros((num_lanes, num_rows), dtype=bool),
+            completion=np.zeros((num_lanes, num_rows), dtype=bool),
+            call_day=np.full((num_lanes, num_rows), NO_DAY, dtype=np.int32),
+            planned_day=np.full((num_lanes, num_rows), NO_DAY, dtype=np.int32),
+            completion_day=np.full((num_lanes, num_rows), NO_DAY, dtype=np.int32),
+            completion_counter=np.full((num_lanes, num_rows), np.nan),
+            last_completion_counter_item=np.zeros((num_lanes, len(item_names))),
+            last_completion_counter=np.zeros(num_lanes),
+            last_completion_counter_var=np.zeros(num_lanes),
+            next_call_number=np.ones(num_lanes, dtype=np.int64),
+            last_completed_call_number=np.zeros(num_lanes, dtype=np.int64),
+        )
+
+    def to_frame(self, lane_columns: dict[str, Any] | None = None) -> pd.DataFrame:
+        """
+        Expand to the row-per-work-order layout returned by `run_simulation`.
+
+        `lane_columns` maps extra column names (e.g. `simulation`, `asset`) to
+        one value per lane.
+        """
+        import pandas as pd
+
+        lanes, rows = self.num_lanes, self.num_rows
+
+        def per_lane(values: np.ndarray) -> np.ndarray:
+            return np.repeat(values, rows)
+
+        def per_row(values: np.ndarray) -> np.ndarray:
+            return np.tile(values, lanes)
+
+        def days(values: np.ndarray) -> np.ndarray:
+            flat = values.reshape(-1).astype(np.float64)
+            flat[flat == NO_DAY] = np.nan
+            return flat
+
+        called = self.called.reshape(-1)
+        call_number = per_row(self.call_number)
+        columns = {
+            "item": per_row(np.asarray(self.item_names, dtype=object)[self.item_codes]),
+            "cycle": per_row(self.cycle),
+            "call_number": call_number,
+            "next_planned_counter": self.next_planned_counter.reshape(-1),
+            "planned_day": days(self.planned_day),
+            "call_day": days(self.call_day),
+            "work_order_number": np.where(called, call_number, np.nan),
+            "completion_day": days(self.completion_day),
+            "completion_counter": self.completion_counter.reshape(-1),
+            "annual_estimate": self.annual_estimate.reshape(-1),
+            "units_prior_for_call": self.units_prior_for_call.reshape(-1),
+            "called": called,
+            "completion": self.completion.reshape(-1),
+            "call_counter": self.call_counter.reshape(-1),
+            "last_completion_counter": per_lane(self.last_completion_counter),
+            "last_completion_counter_item": self.last_completion_counter_item[
+                :, self.item_codes
+            ].reshape(-1),
+            "last_completion_counter_var": per_lane(self.last_completion_counter_var),
+            "open_work_orders": per_lane((self.called & ~self.completion).any(axis=1)),
+            "next_call_number": per_lane(self.next_call_number),
+            "last_completed_call_number": per_lane(self.last_completed_call_number),
+        }
+        for name, values in (lane_columns or {}).items():
+            columns[name] = per_lane(np.asarray(values))
+        return pd.DataFrame(columns)
+
+
+class _BatchEngine:
+    """Apply the `run_simulation` state transitions to subsets of lanes."""
+
+    def __init__(self, state: BatchedWorkOrders, params: ParameterSet) -> None:
+        self.state = state
+        self.params = params
+
+    def recalculate(self, lanes: slice | np.ndarray) -> None:
+        state, params = self.state, self.params
+        called = state.called[lanes]
+        uncalled = ~called
+        call_number = state.call_number[None, :]
+        next_call = state.next_call_number[lanes][:, None]
+
+        eligible = uncalled
+        if params.completion_requirement:
+            open_orders = (called & ~state.completion[lanes]).any(axis=1)
+            eligible = uncalled & ~open_orders[:, None] & (call_number == next_call)
+
+        planned = state.next_planned_counter[lanes]
+        if params.suppressed:
+            last = np.broadcast_to(
+                state.last_completion_counter[lanes][:, None], planned.shape
+            )
+        else:
+            last = state.last_completion_counter_item[lanes][:, state.item_codes]
+        last_counter = np.where(last != 0, last, planned - params.package_cycle)
+
+        diff = call_number - state.last_completed_call_number[lanes][:, None]
+        var = state.last_completion_counter_var[lanes][:, None]
+        shifted = last_counter + params.package_cycle * diff
+        if 0 < params.late_shift < 1:
+            shifted = np.where(var > 0, shifted - params.late_shift * var, shifted)
+        if 0 < params.early_shift < 1:
+            shifted = np.where(
+                var < 0, shifted + params.early_shift * np.abs(var), shifted
+            )
+
+        planned = np.where(eligible & (call_number >= next_call), shifted, planned)
+        state.next_planned_counter[lanes] = planned
+        state.call_counter[lanes] = np.where(
+            eligible,
+            planned - state.units_prior_for_call[lanes],
+            state.call_counter[lanes],
+        )
+
+    def update_annual_estimate(self, annual_estimate: np.ndarray) -> None:
+        state = self.state
+        uncalled = ~state.called
+        units_prior = (annual_estimate / 365) * self.params.call_horizon_days
+        state.annual_estimate[:] = np.where(
+            uncalled, annual_estimate[:, None], state.annual_estimate
+        )
+        state.units_prior_for_call[:] = np.where(
+            uncalled, units_prior[:, None], state.units_prior_for_call
+        )
+        self.recalculate(slice(None))
+
+    def call(self, lanes: np.ndarray, row: int, day: int, counter: np.ndarray) -> None:
+        state = self.state
+        mask = (state.call_counter[lanes] < counter[:, None]) & ~state.called[lanes]
+        state.call_day[lanes] = np.where(mask, day, state.call_day[lanes])
+        state.planned_day[lanes] = np.where(
+            mask, day + self.params.call_horizon_days, state.planned_day[lanes]
+        )
+        state.called[lanes] |= mask
+        state.next_call_number[lanes] = state.call_number[row] + 1
+        self.recalculate(lanes)
+
+    def complete(
+        self, lanes: np.ndarray, row: int, day: int, counter: np.ndarray
+    ) -> None:
+        state = self.state
+        state.completion_day[lanes, row] = day
+        state.completion_counter[lanes, row] = counter
+        state.completion[lanes, row] = True
+        state.last_completion_counter_var[lanes] = (
+            state.next_planned_counter[lanes, row] - counter
+        )
+        state.last_completion_counter_item[lanes, state.item_codes[row]] = counter
+        state.last_completion_counter[lanes] = counter
+        state.last_completed_call_number[lanes] = state.call_number[row]
+        self.recalculate(lanes)
+
+
+def _window_annual_estimate(utilisation: np.ndarray, day: int) -> np.ndarray:
+    """Per-lane `recalculate_annual_estimate` over the trailing 30-day window."""
+    start = max(0, day - 29)
+    # Sum day by day in float64 to reproduce the reference's sequential
+    # summation of Python floats, also on compact (float32) counters
+    total = utilisation[:, start].astype(np.float64)
+    for window_day in range(start + 1, day + 1):
+        total += utilisation[:, window_day]
+    return total / (day - start + 1) * 365
+
+
+def simulate_lanes(
+    utilisation: np.ndarray,
+    cumulative: np.ndarray,
+    parameter_config: dict[str, Any] | ParameterSet,
+) -> BatchedWorkOrders | None:
+    """
+    Run the work-order engine over every lane of a (num_lanes, num_days) batch.
+
+    Produces the same per-lane results as `run_simulation`, but each day is
+    one set of array operations across all lanes; Python only loops over
+    days and over schedule rows that trigger an event on that day.
+    Returns None when the parameter set produces no work orders.
+    """
+    params = compile_parameters(parameter_config)
+    schedule = build_schedule(params)
+    if schedule is None or not schedule.num_rows:
+        return None
+
+    num_lanes, num_days = cumulative.shape
+    state = BatchedWorkOrders.from_schedule(schedule, num_lanes)
+    engine = _BatchEngine(state, params)
+    all_lanes = slice(None)
+
+    engine.recalculate(all_lanes)
+    for day in range(num_days):
+        counter = cumulative[:, day]
+
+        if day % 7 == 0:
+            engine.recalculate(all_lanes)
+
+        if day % params.recalc_days == 0:
+            engine.update_annual_estimate(_window_annual_estimate(utilisation, day))
+
+        to_call = ~state.called & (counter[:, None] > state.call_counter)
+        for row in np.flatnonzero(to_call.any(axis=0)):
+            lanes = np.flatnonzero(to_call[:, row])
+            engine.call(lanes, row, day, counter[lanes])
+
+        to_complete = state.called & ~state.completion & (state.planned_day == day)
+        for row in np.flatnonzero(to_complete.any(axis=0)):
+            lanes = np.flatnonzero(to_complete[:, row])
+            engine.complete(lanes, row, day, counter[lanes])
+
+    return state
+
+
+def is_fleet_config(config: dict[str, Any]) -> bool:
+    """Return True when a config describes a fleet (`assets` or `num_assets`)."""
+    return "assets" in config or "num_assets" in config
+
+
+@dataclass
+class FleetResult:
+    """Fleet run output: work orders for every (simulation, asset) lane."""
+
+    asset_names: tuple[str, ...]
+    num_simulations: int
+    work_orders: BatchedWorkOrders | None
+
+    def to_frame(self) -> pd.DataFrame:
+        """Row-per-work-order frame with `simulation` and `asset` columns."""
+        import pandas as pd
+
+        if self.work_orders is None:
+            return pd.DataFrame(columns=WORK_ORDER_COLUMNS + ["simulation", "asset"])
+        return self.work_orders.to_frame(self.lane_columns())
+
+    def lane_columns(self, first_simulation: int = 0) -> dict[str, np.ndarray]:
+        """Per-lane `simulation` and `asset`, simulations from `first_simulation`."""
+        num_assets = len(self.asset_names)
+        return {
+            "simulation": np.repeat(
+                np.arange(first_simulation, first_simulation + self.num_simulations),
+                num_assets,
+            ),
+            "asset": np.tile(
+                np.asarray(self.asset_names, dtype=object), self.num_simulations
+            ),
+        }
+
+
+def run_fleet_simulation(
+    config: dict[str, Any],
+    parameter_config: dict[str, Any] | ParameterSet,
+) -> FleetResult:
+    """
+    Simulate every asset of a fleet with one batched engine.
+
+    Utilisation is generated per asset by `build_fleet_counter_arrays`; all
+    (simulation, asset) lanes then share one batched work-order state.
+    """
+    params = compile_parameters(parameter_config)
+    asset_names, utilisation, cumulative = build_fleet_counter_arrays(config)
+    num_simulations, num_assets, num_days = utilisation.shape
+    lanes = num_simulations * num_assets
+    work_orders = simulate_lanes(
+        utilisation.reshape(lanes, num_days),
+        cumulative.reshape(lanes, num_days),
+        params,
+    )
+    return FleetResult(asset_names, num_simulations, work_orders)
+
+
+def run_batched_simulation(
+    counter_df: pd.DataFrame,
+    parameter_config: dict[str, Any] | ParameterSet,
+) -> pd.DataFrame:
+    """
+    Drop-in replacement for `run_simulation(..., export_csv=False)`.
+
+    Treats each simulation of `build_counter_data` output as one lane.
+    """
+    from .montecarlo import build_work_order_schedule
+
+    simulation_ids = counter_df.index.get_level_values("simulation").unique()
+    num_simulations = len(simulation_ids)
+    utilisation = counter_df["utilisation"].to_numpy().reshape(num_simulations, -1)
+    cumulative = (
+        counter_df["cumulative_utilisation"].to_numpy().reshape(num_simulations, -1)
+    )
+    work_orders = simulate_lanes(utilisation, cumulative, parameter_config)
+    if work_orders is None:
+        return build_work_order_schedule(parameter_config)
+    return work_orders.to_frame({"simulation": np.asarray(simulation_ids)})
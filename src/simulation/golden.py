@@ -0,0 +1,273 @@
+"""
+Golden-output regression harness.
+
+Seeded reference outputs for a matrix of configs live in `tests/golden/`.
+Every backend must reproduce them; `compare_work_orders` reports the first
+divergent day and event when one does not.
+
+Regenerate the goldens (only after an intended behaviour change):
+
+    uv run python -m src.simulation.golden tests/golden
+"""
+
+import argparse
+import itertools
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .backends import get_backend
+from .montecarlo import build_counter_data, run_simulation
+
+GOLDEN_SEED = 20240101
+GOLDEN_COUNTER_CONFIG: dict[str, Any] = {
+    "num_simulations": 2,
+    "num_days": 150,
+    "daily_utilisations": {
+        "base": {
+            "after_day": 0,
+            "distribution": "normal",
+            "mean": 5,
+            "std": 3,
+            "min": 0,
+            "max": 12,
+        },
+        "later": {"after_day": 60, "distribution": "poisson", "lambda": 4},
+    },
+}
+COUNTERS_FILE = "counters.csv"
+
+_BASE_PARAMETERS: dict[str, Any] = {
+    "package_cycle": 50,
+    "items": {"replace couplings": 50, "overhaul": 100, "replace pump": 200},
+    "annual_estimate": 1800,
+}
+_PROFILES: dict[str, dict[str, Any]] = {
+    "unshifted_weekly": {
+        "early_shift_factors": 0,
+        "late_shift_factors": 0,
+        "annual_estimate_recalculate_after_days": 7,
+        "call_horizon_days": 0,
+    },
+    "shifted_monthly": {
+        "early_shift_factors": 0.5,
+        "late_shift_factors": 0.5,
+        "annual_estimate_recalculate_after_days": 30,
+        "call_horizon_days": 3,
+    },
+    "late_shift_daily": {
+        "early_shift_factors": 0,
+        "late_shift_factors": 0.25,
+        "annual_estimate_recalculate_after_days": 1,
+        "call_horizon_days": 10,
+    },
+}
+GOLDEN_CASES: dict[str, dict[str, Any]] = {
+    f"{profile}_{'suppressed' if suppressed else 'per_item'}_"
+    f"{'sequential' if completion_requirement else 'free'}": {
+        **_BASE_PARAMETERS,
+        **_PROFILES[profile],
+        "suppressed": suppressed,
+        "completion_requirement": completion_requirement,
+    }
+    for profile, suppressed, completion_requirement in itertools.product(
+        _PROFILES, (False, True), (False, True)
+    )
+}
+
+
+@dataclass(frozen=True)
+class Divergence:
+    """Where a backend's work-order table first differs from the golden output."""
+
+    reason: str
+    columns: tuple[str, ...] = ()
+    row: int | None = None
+    simulation: int | None = None
+    call_number: int | None = None
+    item: str | None = None
+    day: float | None = None
+    event: str | None = None
+    expected: Any = None
+    actual: Any = None
+
+    def __str__(self) -> str:
+        if self.row is None:
+            return self.reason
+        where = f"day {self.day:g}" if self.day is not None else "no event day"
+        return (
+            f"{self.reason}: first divergence at {where} ({self.event}) in "
+            f"simulation {self.simulation}, call {self.call_number} ({self.item}); "
+            f"column {self.columns[0]!r} expected {self.expected!r}, got "
+            f"{self.actual!r}; differing columns: {', '.join(self.columns)}"
+        )
+
+
+def _mismatches(expected: pd.Series, actual: pd.Series, rtol: float, atol: float):
+    if pd.api.types.is_numeric_dtype(expected) and not pd.api.types.is_bool_dtype(
+        expected
+    ):
+        left = expected.to_numpy(dtype=np.float64)
+        right = pd.to_numeric(actual).to_numpy(dtype=np.float64)
+        close = np.isclose(left, right, rtol=rtol, atol=atol, equal_nan=True)
+        return ~close
+    return expected.to_numpy() != actual.to_numpy()
+
+
+def _event(expected: pd.Series, actual: pd.Series, columns: list[str]):
+    """Return (day, event) for one divergent row; earliest disagreeing event first."""
+    for event, day_column in (("call", "call_day"), ("completion", "completion_day")):
+        if day_column in columns:
+            days = [expected[day_column], actual[day_column]]
+            return float(np.nanmin(np.asarray(days, dtype=np.float64))), event
+    known = [
+        float(row[column])
+        for row in (expected, actual)
+        for column in ("call_day", "completion_day")
+        if column in row and pd.notna(row[column])
+    ]
+    return (min(known) if known else None), "state"
+
+
+def compare_work_orders(
+    expected: pd.DataFrame,
+    actual: pd.DataFrame,
+    rtol: float = 1e-9,
+    atol: float = 1e-9,
+) -> Divergence | None:
+    """
+    Diff two work-order tables column by column.
+
+    Numeric columns match within `rtol`/`atol` (NaN equals NaN); other
+    columns must be equal. Returns None when the tables match, otherwise the
+    divergence with the earliest event day (calls before completions, rows
+    with no event day last).
+    """
+    if list(actual.columns) != list(expected.columns):
+        missing = [c for c in expected.columns if c not in actual.columns]
+        extra = [c for c in actual.columns if c not in expected.columns]
+        return Divergence(
+            f"Columns differ (missing {missing}, extra {extra}, or order changed)",
+            columns=tuple(missing + extra),
+        )
+    if len(actual) != len(expected):
+        return Divergence(
+            f"Row count differs: expected {len(expected)}, got {len(actual)}"
+        )
+
+    expected = expected.reset_index(drop=True)
+    actual = actual.reset_index(drop=True)
+    masks = {
+        column: _mismatches(expected[column], actual[column], rtol, atol)
+        for column in expected.columns
+    }
+    rows = np.flatnonzero(np.logical_or.reduce(list(masks.values())))
+    if rows.size == 0:
+        return None
+
+    candidates = []
+    for row in rows:
+        columns = [column for column, mask in masks.items() if mask[row]]
+        day, event = _event(expected.loc[row], actual.loc[row], columns)
+        order = (day is None, day if day is not None else 0, event != "call", row)
+        candidates.append((order, row, columns, day, event))
+    _, row, columns, day, event = min(candidates)
+
+    first = next(
+        (c for c in ("call_day", "completion_day") if c in columns), columns[0]
+    )
+    columns = [first] + [column for column in columns if column != first]
+    record = expected.loc[row]
+    return Divergence(
+        f"{rows.size} row(s) differ",
+        columns=tuple(columns),
+        row=int(row),
+        simulation=int(record["simulation"]) if "simulation" in record else None,
+        call_number=int(record["call_number"]),
+        item=str(record["item"]),
+        day=day,
+        event=event,
+        expected=record[first],
+        actual=actual.loc[row, first],
+    )
+
+
+def load_golden_counters(directory: str | Path) -> pd.DataFrame:
+    """Read the stored golden counter paths (independent of the RNG stream)."""
+    return pd.read_csv(Path(directory) / COUNTERS_FILE, index_col=["simulation", "day"])
+
+
+def load_golden_output(directory: str | Path, case: str) -> pd.DataFrame:
+    """Read the reference work-order table for `case`."""
+    return pd.read_csv(Path(directory) / f"{case}.csv")
+
+
+def check_backend(
+    backend: str,
+    directory: str | Path,
+    rtol: float = 1e-9,
+    atol: float = 1e-9,
+    dtype: np.dtype | type | None = None,
+) -> dict[str, Divergence | None]:
+    """
+    Run `backend` on every golden case; maps case name to its divergence (or None).
+
+    With `dtype` (e.g. float32 for compact runs), the stored counters are cast
+    first and compared against `run_simulation` on the same cast counters,
+    as the stored goldens only hold float64 results.
+    """
+    run = get_backend(backend)
+    counter_df = load_golden_counters(directory)
+    if dtype is not None:
+        counter_df = counter_df.astype(dtype)
+
+    def expected(case: str, parameters: dict[str, Any]) -> pd.DataFrame:
+        if dtype is None:
+            return load_golden_output(directory, case)
+        return run_simulation(counter_df, parameters, export_csv=False)
+
+    return {
+        case: compare_work_orders(
+            expected(case, parameters),
+            run(counter_df, parameters),
+            rtol=rtol,
+            atol=atol,
+        )
+        for case, parameters in GOLDEN_CASES.items()
+    }
+
+
+def write_golden_outputs(directory: str | Path) -> list[Path]:
+    """Regenerate the golden counters and reference outputs in `directory`."""
+    destination = Path(directory)
+    destination.mkdir(parents=True, exist_ok=True)
+    np.random.seed(GOLDEN_SEED)
+    build_counter_data(GOLDEN_COUNTER_CONFIG).to_csv(destination / COUNTERS_FILE)
+
+    # Re-read so goldens are computed from exactly what later runs will load
+    counter_df = load_golden_counters(destination)
+    written = [destination / COUNTERS_FILE]
+    for case, parameters in GOLDEN_CASES.items():
+        path = destination / f"{case}.csv"
+        run_simulation(counter_df, parameters, export_csv=False).to_csv(
+            path, index=False
+        )
+        written.append(path)
+    return written
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Regenerate golden reference outputs with run_simulation."
+    )
+    parser.add_argument("directory", help="golden output directory (tests/golden)")
+    args = parser.parse_args(argv)
+    for path in write_golden_outputs(args.directory):
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Historical counter store.
+
+Convert real counter readings into a compact memory-mapped store once, then
+replay or block-bootstrap it as utilisation paths without re-parsing.
+
+Usage (from the project root):
+
+    uv run python -m src.simulation.history readings.csv data/history_store
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+UTILISATION_FILE = "utilisation.npy"
+META_FILE = "meta.json"
+
+
+@dataclass(frozen=True)
+class CounterStore:
+    """
+    Daily utilisation history per asset, memory-mapped read-only.
+
+    `utilisation` is shaped (num_assets, num_days) on a shared daily calendar
+    starting at `start_date`; days outside an asset's readings are NaN.
+    """
+
+    path: Path
+    assets: tuple[str, ...]
+    start_date: str
+    utilisation: np.ndarray
+
+    @classmethod
+    def open(cls, path: str | Path) -> "CounterStore":
+        """Open a store written by `ingest_counter_readings` without copying it."""
+        store_path = Path(path)
+        meta = json.loads((store_path / META_FILE).read_text(encoding="utf-8"))
+        utilisation = np.load(store_path / UTILISATION_FILE, mmap_mode="r")
+        if utilisation.shape[0] != len(meta["assets"]):
+            raise ValueError(
+                f"Counter store {store_path} is inconsistent (being re-ingested?)."
+            )
+        return cls(
+            path=store_path,
+            assets=tuple(meta["assets"]),
+            start_date=meta["start_date"],
+            utilisation=utilisation,
+        )
+
+    def asset_history(self, asset: str) -> np.ndarray:
+        """Return the asset's observed days as a zero-copy view."""
+        try:
+            row = self.utilisation[self.assets.index(asset)]
+        except ValueError:
+            raise ValueError(f"Asset '{asset}' is not in {self.path}") from None
+        observed = np.flatnonzero(~np.isnan(row))
+        if observed.size == 0:
+            raise ValueError(f"Asset '{asset}' has no history in {self.path}")
+        return row[observed[0] : observed[-1] + 1]
+
+
+def counter_store_mtime_ns(path: str | Path) -> int:
+    """Modification time of a store's utilisation file (changes on re-ingest)."""
+    return (Path(path) / UTILISATION_FILE).stat().st_mtime_ns
+
+
+@lru_cache(maxsize=16)
+def open_counter_store(path: str, mtime_ns: int) -> CounterStore:
+    """
+    Open (and cache per process) the store at `path`.
+
+    Pass `counter_store_mtime_ns(path)`, so a store re-ingested by any process
+    is reopened instead of served stale from the cache.
+    """
+    return CounterStore.open(path)
+
+
+def _replace_file(directory: Path, name: str, write: Callable[[str], None]) -> None:
+    # Write beside the target and swap it in: readers that still map the old
+    # file keep a complete copy, new readers see the new one
+    handle, temp_name = tempfile.mkstemp(
+        dir=directory, prefix=f".{name}.", suffix=".tmp"
+    )
+    os.close(handle)
+    try:
+        write(temp_name)
+        os.replace(temp_name, directory / name)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def ingest_counter_readings(
+    source: Any,
+    store_path: str | Path,
+    asset_column: str = "asset",
+    date_column: str = "date",
+    reading_column: str = "counter",
+) -> CounterStore:
+    """
+    Convert cumulative counter readings into a counter store.
+
+    `source` is a CSV path or a DataFrame with one row per (asset, date)
+    reading. Readings are placed on a daily calendar, gaps are filled by
+    linear interpolation of the cumulative counter (usage is spread evenly
+    over missing days), and daily utilisation is the day-to-day difference.
+    Negative differences (meter resets or replacements) count as zero usage.
+    Files are written to temporary names and swapped in with `os.replace`
+    (metadata first, utilisation last), so processes that have the old store
+    memory-mapped keep reading it intact.
+    """
+    import pandas as pd
+
+    readings = source if isinstance(source, pd.DataFrame) else pd.read_csv(source)
+    missing = {asset_column, date_column, reading_column} - set(readings.columns)
+    if missing:
+        raise ValueError(f"Counter readings are missing columns: {sorted(missing)}")
+
+    readings = readings[[asset_column, date_column, reading_column]].dropna()
+    readings[date_column] = pd.to_datetime(readings[date_column]).dt.normalize()
+    if readings.empty:
+        raise ValueError("No counter readings to ingest.")
+
+    calendar = pd.date_range(
+        readings[date_column].min(), readings[date_column].max(), freq="D"
+    )
+    assets = tuple(str(asset) for asset in readings[asset_column].unique())
+
+    store_dir = Path(store_path)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    meta = {"assets": list(assets), "start_date": calendar[0].date().isoformat()}
+
+    def write_utilisation(path: str) -> None:
+        utilisation = np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.float64, shape=(len(assets), len(calendar))
+        )
+        for position, (_, asset_readings) in enumerate(
+            readings.groupby(asset_column, sort=False)
+        ):
+            counter = (
+                asset_readings.groupby(date_column)[reading_column]
+                .max()
+                .reindex(calendar)
+                .interpolate(limit_area="inside")
+            )
+            daily = utilisation[position]
+            daily[:] = counter.diff().to_numpy(dtype=np.float64)
+            np.maximum(daily, 0, out=daily, where=~np.isnan(daily))
+        utilisation.flush()
+        del utilisation
+
+    def write_meta(path: str) -> None:
+        Path(path).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    _replace_file(store_dir, META_FILE, write_meta)
+    _replace_file(store_dir, UTILISATION_FILE, write_utilisation)
+    return CounterStore.open(store_dir)
+
+
+def replay_history(history: np.ndarray, out: np.ndarray, offset: int = 0) -> None:
+    """Copy `history[offset:]` into every simulation of a day-major `out` block."""
+    num_days = out.shape[0]
+    if offset < 0 or offset + num_days > history.size:
+        raise ValueError(
+            f"History has {history.size} days; cannot replay {num_days} days "
+            f"from offset {offset}."
+        )
+    out[...] = history[offset : offset + num_days, None]
+
+
+def block_bootstrap_history(
+    history: np.ndarray,
+    out: np.ndarray,
+    rng: np.random.Generator,
+    block_days: int = 30,
+) -> None:
+    """
+    Fill a day-major `out` block with moving-block bootstrap paths.
+
+    Each simulation (column) stitches together random `block_days` windows of
+    history, which keeps short-range patterns that day-level resampling loses.
+    """
+    num_days, num_simulations = out.shape
+    block_days = max(1, min(block_days, history.size))
+    num_blocks = -(-num_days // block_days)
+    starts = rng.integers(
+        0, history.size - block_days + 1, size=(num_blocks, 1, num_simulations)
+    )
+    days = (starts + np.arange(block_days)[None, :, None]).reshape(-1, num_simulations)
+    np.take(history, days[:num_days], out=out)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert counter readings into a memory-mapped counter store."
+    )
+    parser.add_argument("readings", help="CSV with asset, date and counter columns")
+    parser.add_argument("store", help="output store directory")
+    parser.add_argument("--asset-column", default="asset")
+    parser.add_argument("--date-column", default="date")
+    parser.add_argument("--reading-column", default="counter")
+    args = parser.parse_args(argv)
+
+    store = ingest_counter_readings(
+        args.readings,
+        args.store,
+        asset_column=args.asset_column,
+        date_column=args.date_column,
+        reading_column=args.reading_column,
+    )
+    print(
+        f"Wrote {len(store.assets)} asset(s) x {store.utilisation.shape[1]} day(s) "
+        f"from {store.start_date} to {store.path}"
+    )
+
+
+if __name__ == "__main__":
+    main()
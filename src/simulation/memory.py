@@ -0,0 +1,341 @@
+"""
+Memory estimates, run planning under a budget, and per-phase tracking.
+
+The per-row and per-cell costs below were measured with `tracemalloc` on
+the reference and batched engines (peak bytes, including temporaries) and
+are deliberately rounded up. Estimates are for planning, not accounting.
+"""
+
+import contextlib
+import sys
+import tracemalloc
+from collections.abc import Iterator
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+import numpy as np
+
+from src.utils.resources import current_rss_bytes, format_bytes, peak_rss_bytes
+
+from .fleet import is_fleet_config
+from .parameters import ParameterSet
+from .schedule import build_schedule
+
+# Counter generation peak per (simulation, day) cell: buffers, cumsum,
+# DataFrame columns and MultiIndex (fleet runs keep plain arrays)
+COUNTER_BYTES_PER_CELL = 56
+FLEET_COUNTER_BYTES_PER_CELL = 24
+# Engine working set per work-order row (one row per simulation lane)
+ENGINE_BYTES_PER_ROW = {"reference": 3600, "batched": 520}
+RESULT_BYTES_PER_ROW = 200
+COMPACT_BYTES_PER_ROW = 80
+SINK_BYTES_PER_ROW = {"csv": 400, "parquet": 400, "none": 0}
+SINK_FIXED_BYTES = 8 * 1024**2
+# RSS added by the lazy pandas import (reference engine, csv/parquet sinks)
+PANDAS_IMPORT_BYTES = 40 * 1024**2
+
+
+class MemoryBudgetError(RuntimeError):
+    """Raised when a run exceeds, or is estimated to exceed, its memory budget."""
+
+
+@dataclass(frozen=True)
+class MemoryEstimate:
+    """Predicted peak memory of one process, split by component (bytes)."""
+
+    baseline: int
+    counters: int
+    work_order_rows_per_simulation: int
+    simulations_per_chunk: int
+    engine: int
+    retained_results: int
+    sink_buffers: int
+    imports: int = 0
+
+    @property
+    def peak_bytes(self) -> int:
+        return (
+            self.baseline
+            + self.counters
+            + self.engine
+            + self.retained_results
+            + self.sink_buffers
+            + self.imports
+        )
+
+    def summary(self) -> str:
+        """One line per component, for logs and `--estimate`."""
+        return "\n".join(
+            [
+                f"Baseline (interpreter and imports): {format_bytes(self.baseline)}",
+                f"Counter data: {format_bytes(self.counters)}",
+                f"Engine working set ({self.simulations_per_chunk} simulation(s) x "
+                f"{self.work_order_rows_per_simulation} work-order row(s)): "
+                f"{format_bytes(self.engine)}",
+                f"Retained results: {format_bytes(self.retained_results)}",
+                f"Sink buffers: {format_bytes(self.sink_buffers)}",
+                f"Lazy imports (pandas): {format_bytes(self.imports)}",
+                f"Estimated peak: {format_bytes(self.peak_bytes)}",
+            ]
+        )
+
+
+@dataclass(frozen=True)
+class RunPlan:
+    """Workers and chunk size chosen for a run, with the estimates behind them."""
+
+    workers: int
+    chunk_size: int
+    process_budget: int | None
+    main: MemoryEstimate
+    worker: MemoryEstimate | None = None
+
+    def summary(self) -> str:
+        lines = [
+            f"Plan: {self.workers} worker(s), chunks of {self.chunk_size} simulation(s)"
+        ]
+        if self.process_budget is not None:
+            lines.append(f"Per-process budget: {format_bytes(self.process_budget)}")
+        if self.worker is None:
+            lines.append(self.main.summary())
+        else:
+            lines += ["Main process:", self.main.summary(), "Each worker:"]
+            lines.append(self.worker.summary())
+        return "\n".join(lines)
+
+
+def work_order_rows(parameter_sets: list[ParameterSet]) -> int:
+    """Largest number of work-order rows any parameter set schedules per lane."""
+    rows: dict[tuple, int] = {}
+    for params in parameter_sets:
+        # Only the items and suppression decide which rows are scheduled
+        key = (params.items, params.suppressed)
+        if key not in rows:
+            schedule = build_schedule(params)
+            rows[key] = schedule.num_rows if schedule is not None else 0
+    return max(rows.values(), default=0)
+
+
+def uses_pandas(config: dict[str, Any], backend: str, sink_format: str) -> bool:
+    """Whether running `config` imports pandas (the batched `none` path does not)."""
+    if sink_format != "none":
+        return True
+    return backend != "batched" and not is_fleet_config(config)
+
+
+def estimate_memory(
+    config: dict[str, Any],
+    parameter_sets: list[ParameterSet],
+    chunk_size: int | None = None,
+    backend: str = "reference",
+    sink_format: str = "csv",
+    compact: bool = False,
+    baseline: int | None = None,
+    shared_counters: bool = False,
+    rows_per_lane: int | None = None,
+) -> MemoryEstimate:
+    """
+    Predict one process's peak memory for running `parameter_sets` on `config`.
+
+    `chunk_size` simulations are in flight at once (all when None).
+    `shared_counters` estimates a worker that memory-maps stored counters
+    instead of generating them. `baseline` defaults to the current RSS and
+    `rows_per_lane` to `work_order_rows(parameter_sets)`. When the run needs
+    pandas and it is not imported yet, its import cost is added on top.
+    """
+    num_simulations = int(config["num_simulations"])
+    num_days = int(config["num_days"])
+    fleet = is_fleet_config(config)
+    lanes_per_simulation = 1
+    if "assets" in config:
+        lanes_per_simulation = len(config["assets"])
+    elif "num_assets" in config:
+        lanes_per_simulation = int(config["num_assets"])
+
+    cells = num_simulations * num_days * lanes_per_simulation
+    if shared_counters:
+        # Mapped counter pages count towards each worker's RSS
+        counters = (
+            cells * 2 * (np.dtype(np.float32 if compact else np.float64).itemsize)
+        )
+    elif fleet:
+        counters = cells * FLEET_COUNTER_BYTES_PER_CELL
+    else:
+        counters = cells * COUNTER_BYTES_PER_CELL
+
+    chunk = min(chunk_size or num_simulations, num_simulations)
+    if rows_per_lane is None:
+        rows_per_lane = work_order_rows(parameter_sets)
+    rows_per_simulation = rows_per_lane * lanes_per_simulation
+    chunk_rows = chunk * rows_per_simulation
+    engine_bytes = ENGINE_BYTES_PER_ROW.get(backend, ENGINE_BYTES_PER_ROW["reference"])
+    if fleet:
+        # Fleet runs always use the batched engine
+        engine_bytes = ENGINE_BYTES_PER_ROW["batched"]
+    result_bytes = RESULT_BYTES_PER_ROW + (COMPACT_BYTES_PER_ROW if compact else 0)
+    sink_bytes = SINK_BYTES_PER_ROW.get(sink_format, 0)
+    imports = 0
+    if uses_pandas(config, backend, sink_format) and "pandas" not in sys.modules:
+        imports = PANDAS_IMPORT_BYTES
+
+    return MemoryEstimate(
+        baseline=baseline if baseline is not None else (current_rss_bytes() or 0),
+        counters=counters,
+        work_order_rows_per_simulation=rows_per_simulation,
+        simulations_per_chunk=chunk,
+        engine=chunk_rows * engine_bytes,
+        retained_results=chunk_rows * result_bytes,
+        sink_buffers=(
+            chunk_rows * sink_bytes + SINK_FIXED_BYTES if sink_format != "none" else 0
+        ),
+        imports=imports,
+    )
+
+
+def plan_run(
+    config: dict[str, Any],
+    parameter_sets: list[ParameterSet],
+    memory_budget: int | None = None,
+    workers: int = 1,
+    chunk_size: int | None = None,
+    backend: str = "reference",
+    sink_format: str = "csv",
+    compact: bool = False,
+    baseline: int | None = None,
+) -> RunPlan:
+    """
+    Pick workers and chunk size that keep the estimated peak under budget.
+
+    `workers` and `chunk_size` are upper bounds. More workers are preferred,
+    then the largest chunk that fits. With workers, the main process stays
+    resident while they run, so each worker must fit an equal share of what
+    it leaves (`(memory_budget - main.peak_bytes) // workers`). That share is
+    also the limit each process checks against its own peak RSS at runtime;
+    there is no check on the combined RSS. Raises `MemoryBudgetError` when
+    even one worker with one simulation per chunk does not fit. `baseline`
+    defaults to the current RSS.
+    """
+    num_simulations = int(config["num_simulations"])
+    max_chunk = max(1, min(chunk_size or num_simulations, num_simulations))
+    max_workers = (
+        1 if is_fleet_config(config) else max(1, min(workers, len(parameter_sets)))
+    )
+    if baseline is None:
+        baseline = current_rss_bytes() or 0
+    rows_per_lane = work_order_rows(parameter_sets)
+
+    def estimate(chunk: int, shared_counters: bool = False) -> MemoryEstimate:
+        return estimate_memory(
+            config,
+            parameter_sets,
+            chunk,
+            backend,
+            sink_format,
+            compact,
+            baseline=baseline,
+            shared_counters=shared_counters,
+            rows_per_lane=rows_per_lane,
+        )
+
+    # With workers, the main process only generates and stores the counters
+    main = replace(
+        estimate(1),
+        simulations_per_chunk=0,
+        engine=0,
+        retained_results=0,
+        sink_buffers=0,
+        imports=0,
+    )
+
+    if memory_budget is None:
+        if max_workers == 1:
+            return RunPlan(1, max_chunk, None, estimate(max_chunk))
+        return RunPlan(max_workers, max_chunk, None, main, estimate(max_chunk, True))
+
+    for candidate in range(max_workers, 0, -1):
+        shared = candidate > 1
+        if shared:
+            available = memory_budget - main.peak_bytes
+            if available <= 0:
+                continue
+            process_budget = available // candidate
+        else:
+            process_budget = memory_budget
+
+        def peak(chunk: int) -> int:
+            return estimate(chunk, shared).peak_bytes
+
+        if peak(1) > process_budget:
+            continue
+        # The peak grows linearly with the chunk, so bisect for the largest fit
+        low, high = 1, max_chunk
+        while low < high:
+            middle = (low + high + 1) // 2
+            if peak(middle) <= process_budget:
+                low = middle
+            else:
+                high = middle - 1
+        if shared:
+            return RunPlan(candidate, low, process_budget, main, estimate(low, True))
+        return RunPlan(1, low, memory_budget, estimate(low))
+
+    smallest = estimate(1)
+    raise MemoryBudgetError(
+        f"Estimated peak memory {format_bytes(smallest.peak_bytes)} exceeds the "
+        f"budget of {format_bytes(memory_budget)} even with one worker and one "
+        f"simulation per chunk.\n{smallest.summary()}"
+    )
+
+
+@dataclass(frozen=True)
+class PhaseMemory:
+    """Memory observed at the end of one run phase (bytes; None when unknown)."""
+
+    name: str
+    rss_bytes: int | None
+    peak_rss_bytes: int | None
+    allocated_peak_bytes: int | None = None
+
+
+@dataclass
+class MemoryTracker:
+    """
+    Record RSS, and optionally `tracemalloc` peaks, per run phase.
+
+    Allocation tracing slows pandas-heavy code noticeably, so it is opt-in.
+    """
+
+    trace_allocations: bool = False
+    phases: list[PhaseMemory] = field(default_factory=list)
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = False
+        if self.trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started = True
+            tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            allocated = (
+                tracemalloc.get_traced_memory()[1] if self.trace_allocations else None
+            )
+            if started:
+                tracemalloc.stop()
+            self.phases.append(
+                PhaseMemory(name, current_rss_bytes(), peak_rss_bytes(), allocated)
+            )
+
+    def summary(self) -> str:
+        lines = []
+        for phase in self.phases:
+            line = (
+                f"  {phase.name}: RSS {format_bytes(phase.rss_bytes)}, "
+                f"peak {format_bytes(phase.peak_rss_bytes)}"
+            )
+            if phase.allocated_peak_bytes is not None:
+                line += f", allocated peak {format_bytes(phase.allocated_peak_bytes)}"
+            lines.append(line)
+        return "\n".join(lines)
@@ -1,135 +1,131 @@
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from .annual_estimate import recalculate_annual_estimate
-from .utilisation import generate_utilisation
-from src.utils.numbers import resolve_positive_int
+from .counters import build_counter_arrays
+from .parameters import ParameterSet, compile_parameters
+from .schedule import build_schedule
 
 
-def build_counter_data(config: dict[str, Any]) -> pd.DataFrame:
-    """Generate utilisation and cumulative counters per simulation/day."""
-    utilisation = generate_utilisation(
-        config["daily_utilisations"],
-        config["num_simulations"],
-        config["num_days"],
-    )
+def build_counter_data(
+    config: dict[str, Any],
+    dtype: np.dtype | type = np.float64,
+    rng: np.random.Generator | None = None,
+) -> pd.DataFrame:
+    """
+    Generate utilisation and cumulative counters per simulation/day.
+
+    Counters are accumulated in float64 and stored as `dtype` (float32 for
+    compact runs, see `src/simulation/compact.py`). `rng` defaults to one
+    derived from numpy's global state.
+    """
+    utilisation, cumulative = build_counter_arrays(config, rng=rng)
 
     index = pd.MultiIndex.from_product(
         [range(config["num_simulations"]), range(config["num_days"])],
         names=["simulation", "day"],
     )
 
-    df = pd.DataFrame({"utilisation": utilisation.reshape(-1)}, index=index)
-    df["cumulative_utilisation"] = df.groupby("simulation")["utilisation"].cumsum()
-    return df
+    return pd.DataFrame(
+        {
+            "utilisation": utilisation.reshape(-1).astype(dtype, copy=False),
+            "cumulative_utilisation": cumulative.reshape(-1).astype(dtype, copy=False),
+        },
+        index=index,
+    )
 
 
-def build_work_order_schedule(parameter_config: dict[str, Any]) -> pd.DataFrame:
+def counter_frame(counters: np.ndarray, first_simulation: int = 0) -> pd.DataFrame:
     """
-    Build work-order rows from parameter config.
+    View stacked counters (2, num_simulations, num_days) as counter data.
+
+    The frame matches `build_counter_data`, with simulations numbered from
+    `first_simulation`, and shares memory with `counters` (e.g. a slice of a
+    `load_counter_arrays` memory map).
     """
-    annual_estimate = float(parameter_config.get("annual_estimate", 0))
-    recalc_days = resolve_positive_int(
-        parameter_config.get("annual_estimate_recalculate_after_days", 100)
+    _, num_simulations, num_days = counters.shape
+    index = pd.MultiIndex.from_product(
+        [
+            range(first_simulation, first_simulation + num_simulations),
+            range(num_days),
+        ],
+        names=["simulation", "day"],
+    )
+    return pd.DataFrame(
+        counters.reshape(2, -1).T,
+        index=index,
+        columns=["utilisation", "cumulative_utilisation"],
+        copy=False,
     )
-    suppressed = bool(parameter_config.get("suppressed", False))
-    completion_requirement = bool(parameter_config.get("completion_requirement", True))
-    early_shift = float(parameter_config.get("early_shift_factors", 0))
-    late_shift = float(parameter_config.get("late_shift_factors", 0))
-    call_horizon_days = int(parameter_config.get("call_horizon_days", 0))
-    package_cycle = float(parameter_config.get("package_cycle", 0))
-    items = parameter_config.get("items", {})
-
-    records: list[dict[str, Any]] = []
-    for item, cycle in items.items():
-        call_counter = float(cycle)
-        for call_number in range(1, 25):
-            records.append(
-                {
-                    "item": item,
-                    "cycle": float(cycle),
-                    "package_cycle": package_cycle,
-                    "call_number": call_number,
-                    "next_planned_counter": call_counter,
-                    "planned_day": None,
-                    "call_day": None,
-                    "work_order_number": None,
-                    "completion_day": None,
-                    "completion_counter": None,
-                    "annual_estimate": annual_estimate,
-                    "annual_estimate_recalculate_after_days": recalc_days,
-                    "suppressed": suppressed,
-                    "completion_requirement": completion_requirement,
-                    "early_shift": early_shift,
-                    "late_shift": late_shift,
-                    "call_horizon_days": call_horizon_days,
-                    "units_prior_for_call": round(
-                        (annual_estimate / 365) * call_horizon_days, 0
-                    ),
-                    "called": False,
-                    "completion": False,
-                }
-            )
-            call_counter += float(cycle)
-
-    work_order_df = pd.DataFrame.from_records(records)
-    if work_order_df.empty:
-        return work_order_df
-
-    if suppressed:
-        work_order_df = (
-            work_order_df.sort_values(
-                by=["next_planned_counter", "cycle"], ascending=[True, False]
-            )
-            .drop_duplicates(subset=["next_planned_counter"])
-            .reset_index(drop=True)
-        )
-    else:
-        work_order_df = work_order_df.sort_values(
-            by=["next_planned_counter", "cycle", "item"]
-        ).reset_index(drop=True)
 
-    work_order_df["call_number"] = range(1, len(work_order_df) + 1)
 
-    min_cycle = work_order_df["cycle"].min()
-    last_index = work_order_df[work_order_df["cycle"] == min_cycle].index[-1]
-    filtered_df = work_order_df.iloc[:last_index].copy()
+def build_work_order_schedule(
+    parameter_config: dict[str, Any] | ParameterSet,
+) -> pd.DataFrame:
+    """
+    Build work-order rows from parameter config.
 
-    filtered_df = filtered_df.reset_index(drop=True)
-    filtered_df["call_number"] = range(1, len(filtered_df) + 1)
-    filtered_df["call_counter"] = (
-        filtered_df["next_planned_counter"] - filtered_df["units_prior_for_call"]
+    Rows come from `build_schedule` (`src/simulation/schedule.py`) plus the
+    per-work-order state columns. Per-run scalars (suppression, shift
+    factors, call horizon, ...) stay on the compiled `ParameterSet`.
+    """
+    schedule = build_schedule(parameter_config)
+    if schedule is None:
+        return pd.DataFrame.from_records([])
+
+    num_rows = schedule.num_rows
+
+    def unset() -> list[None]:
+        return [None] * num_rows
+
+    return pd.DataFrame(
+        {
+            "item": schedule.items,
+            "cycle": schedule.cycle,
+            "call_number": schedule.call_number,
+            "next_planned_counter": schedule.next_planned_counter,
+            "planned_day": unset(),
+            "call_day": unset(),
+            "work_order_number": unset(),
+            "completion_day": unset(),
+            "completion_counter": unset(),
+            "annual_estimate": np.full(num_rows, schedule.annual_estimate),
+            "units_prior_for_call": np.full(num_rows, schedule.units_prior_for_call),
+            "called": np.zeros(num_rows, dtype=bool),
+            "completion": np.zeros(num_rows, dtype=bool),
+            "call_counter": schedule.call_counter,
+            "last_completion_counter": np.zeros(num_rows),
+            "last_completion_counter_item": np.zeros(num_rows),
+            "last_completion_counter_var": np.zeros(num_rows),
+            "open_work_orders": np.zeros(num_rows, dtype=bool),
+            "next_call_number": np.ones(num_rows, dtype=np.int64),
+            "last_completed_call_number": np.zeros(num_rows, dtype=np.int64),
+        }
     )
-    filtered_df["last_completion_counter"] = 0.0
-    filtered_df["last_completion_counter_item"] = 0.0
-    filtered_df["last_completion_counter_var"] = 0.0
-    filtered_df["open_work_orders"] = False
-    filtered_df["next_call_number"] = 1
-    filtered_df["last_completed_call_number"] = 0
-
-    return filtered_df
 
 
 def run_simulation(
     df: pd.DataFrame,
-    parameter_config: dict[str, Any],
+    parameter_config: dict[str, Any] | ParameterSet,
     export_csv: bool = True,
     output_dir: str = ".",
 ) -> pd.DataFrame:
     """
     Run simulation against utilisation/cumulative counter data.
+
+    `df` is only read, so it may be shared (or memory-mapped) across runs.
     """
-    df = df.copy()
-    base_work_order_df = build_work_order_schedule(parameter_config)
+    params = compile_parameters(parameter_config)
+    base_work_order_df = build_work_order_schedule(params)
     if base_work_order_df.empty:
         return base_work_order_df
 
-    call_horizon_days = int(base_work_order_df["call_horizon_days"].iloc[0])
-    recalc_days = resolve_positive_int(
-        base_work_order_df["annual_estimate_recalculate_after_days"].iloc[0]
-    )
+    call_horizon_days = params.call_horizon_days
+    recalc_days = params.recalc_days
+    package_cycle = params.package_cycle
     all_simulation_results: list[pd.DataFrame] = []
 
     def recalculate_calls(work_order_df: pd.DataFrame) -> pd.DataFrame:
@@ -144,31 +140,31 @@ def run_simulation(
                 return row
 
             recal = (
-                row["completion_requirement"]
+                params.completion_requirement
                 and not row["open_work_orders"]
                 and row["call_number"] == row["next_call_number"]
             )
-            if row["completion_requirement"] and not recal:
+            if params.completion_requirement and not recal:
                 return row
 
             last = (
                 row["last_completion_counter"]
-                if row["suppressed"]
+                if params.suppressed
                 else row["last_completion_counter_item"]
             )
             last_counter = (
-                last if last != 0 else row["next_planned_counter"] - row["package_cycle"]
+                last if last != 0 else row["next_planned_counter"] - package_cycle
             )
 
             if row["call_number"] >= row["next_call_number"]:
                 diff = row["call_number"] - row["last_completed_call_number"]
                 var = row["last_completion_counter_var"]
-                shifted_counter = last_counter + (row["package_cycle"] * diff)
+                shifted_counter = last_counter + (package_cycle * diff)
 
-                if var > 0 and 0 < row["late_shift"] < 1:
-                    shifted_counter -= row["late_shift"] * var
-                elif var < 0 and 0 < row["early_shift"] < 1:
-                    shifted_counter += row["early_shift"] * abs(var)
+                if var > 0 and 0 < params.late_shift < 1:
+                    shifted_counter -= params.late_shift * var
+                elif var < 0 and 0 < params.early_shift < 1:
+                    shifted_counter += params.early_shift * abs(var)
 
                 row["next_planned_counter"] = shifted_counter
 
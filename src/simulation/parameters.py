@@ -1,20 +1,182 @@
+from dataclasses import dataclass
 from typing import Any
 
 from src.utils.numbers import resolve_positive_int
 
+from .distributions import DISTRIBUTIONS
 
-def get_parameters(params_cfg: dict[str, Any]) -> dict[str, Any]:
-    """Extract simulation parameters with safe optional keys."""
-    return {
-        "items": params_cfg["items"],
-        "suppressed": params_cfg["suppressed"],
-        "completion_requirement": params_cfg["completion_requirement"],
-        "early_shift_factors": params_cfg["early_shift_factors"],
-        "late_shift_factors": params_cfg["late_shift_factors"],
-        "call_horizon_days": params_cfg["call_horizon_days"],
-        "basic_start_date": params_cfg.get("basic_start_date"),
-        "annual_estimate_recalculate_after_days": resolve_positive_int(
-            params_cfg.get("annual_estimate_recalculate_after_days", 100),
-            default=100,
-        ),
-    }
+
+def _as_float(cfg: dict[str, Any], key: str, default: float) -> float:
+    value = cfg.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Parameter '{key}' must be a number, got {value!r}")
+    return float(value)
+
+
+def _as_int(cfg: dict[str, Any], key: str, default: int) -> int:
+    value = cfg.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Parameter '{key}' must be an integer, got {value!r}")
+    if int(value) != value:
+        raise ValueError(f"Parameter '{key}' must be a whole number, got {value!r}")
+    return int(value)
+
+
+def _as_bool(cfg: dict[str, Any], key: str, default: bool) -> bool:
+    value = cfg.get(key, default)
+    if not isinstance(value, (bool, int)):
+        raise ValueError(f"Parameter '{key}' must be a boolean, got {value!r}")
+    return bool(value)
+
+
+@dataclass(frozen=True, slots=True)
+class ParameterSet:
+    """
+    Validated, immutable view of one parameter combination.
+
+    Compiled once per parameter set so hot simulation code reads plain
+    attributes instead of parsing the raw config dict. Instances are
+    hashable and can be used as cache keys.
+    """
+
+    items: tuple[tuple[str, float], ...]
+    package_cycle: float = 0.0
+    annual_estimate: float = 0.0
+    recalc_days: int = 100
+    suppressed: bool = False
+    completion_requirement: bool = True
+    early_shift: float = 0.0
+    late_shift: float = 0.0
+    call_horizon_days: int = 0
+    basic_start_date: str | None = None
+
+    @property
+    def units_prior_for_call(self) -> float:
+        """Counter units expected over the call horizon at the annual estimate."""
+        return round((self.annual_estimate / 365) * self.call_horizon_days, 0)
+
+    @classmethod
+    def from_config(cls, params_cfg: dict[str, Any]) -> "ParameterSet":
+        """Validate a raw parameter combination and compile it."""
+        items_cfg = params_cfg.get("items", {})
+        if not isinstance(items_cfg, dict):
+            raise ValueError("Parameter 'items' must map item names to cycles.")
+
+        items: list[tuple[str, float]] = []
+        for item, cycle in items_cfg.items():
+            if isinstance(cycle, bool) or not isinstance(cycle, (int, float)):
+                raise ValueError(f"Cycle for item '{item}' must be a number.")
+            if cycle <= 0:
+                raise ValueError(f"Cycle for item '{item}' must be positive.")
+            items.append((str(item), float(cycle)))
+
+        parameter_set = cls(
+            items=tuple(items),
+            package_cycle=_as_float(params_cfg, "package_cycle", 0),
+            annual_estimate=_as_float(params_cfg, "annual_estimate", 0),
+            recalc_days=resolve_positive_int(
+                params_cfg.get("annual_estimate_recalculate_after_days", 100),
+                default=100,
+            ),
+            suppressed=_as_bool(params_cfg, "suppressed", False),
+            completion_requirement=_as_bool(params_cfg, "completion_requirement", True),
+            early_shift=_as_float(params_cfg, "early_shift_factors", 0),
+            late_shift=_as_float(params_cfg, "late_shift_factors", 0),
+            call_horizon_days=_as_int(params_cfg, "call_horizon_days", 0),
+            basic_start_date=params_cfg.get("basic_start_date"),
+        )
+        if parameter_set.package_cycle < 0:
+            raise ValueError("Parameter 'package_cycle' must not be negative.")
+        if parameter_set.annual_estimate < 0:
+            raise ValueError("Parameter 'annual_estimate' must not be negative.")
+        if parameter_set.call_horizon_days < 0:
+            raise ValueError("Parameter 'call_horizon_days' must not be negative.")
+        return parameter_set
+
+
+@dataclass(frozen=True, slots=True)
+class UtilisationPhase:
+    """Validated utilisation phase starting at `after_day`."""
+
+    name: str
+    after_day: int
+    distribution: str
+    params: tuple[tuple[str, Any], ...]
+    minimum: float | None = None
+    maximum: float | None = None
+
+    def param(self, key: str) -> Any:
+        """Return a distribution parameter by config key."""
+        return dict(self.params)[key]
+
+
+def compile_parameters(params_cfg: dict[str, Any] | ParameterSet) -> ParameterSet:
+    """Return `params_cfg` as a compiled `ParameterSet`."""
+    if isinstance(params_cfg, ParameterSet):
+        return params_cfg
+    return ParameterSet.from_config(params_cfg)
+
+
+def compile_utilisation_phases(
+    dist_cfg: dict[str, Any], num_days: int
+) -> tuple[UtilisationPhase, ...]:
+    """
+    Validate utilisation phases.
+
+    Phases must be declared in strictly increasing `after_day` order within
+    `[0, num_days)` and carry the keys their distribution needs, within the
+    ranges its `check` accepts (e.g. `std >= 0`).
+    """
+    phases: list[UtilisationPhase] = []
+    previous_day = -1
+    for name, phase in dist_cfg.items():
+        if not isinstance(phase, dict):
+            raise ValueError(f"Utilisation phase '{name}' must be a mapping.")
+        if "after_day" not in phase:
+            raise ValueError(f"Utilisation phase '{name}' is missing 'after_day'.")
+        after_day = _as_int(phase, "after_day", 0)
+        if after_day <= previous_day:
+            raise ValueError(
+                f"Utilisation phase '{name}' starts on day {after_day}; phases "
+                "must be listed in strictly increasing 'after_day' order."
+            )
+        if after_day >= num_days:
+            raise ValueError(
+                f"Utilisation phase '{name}' starts after the last day ({num_days - 1})."
+            )
+
+        distribution = phase.get("distribution")
+        if not isinstance(distribution, str) or distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unsupported distribution: {distribution}")
+        spec = DISTRIBUTIONS[distribution]
+        missing = [key for key in spec.keys if key not in phase]
+        if missing:
+            raise ValueError(f"Utilisation phase '{name}' is missing {missing}.")
+        try:
+            params = (
+                spec.prepare(phase)
+                if spec.prepare is not None
+                else tuple((key, _as_float(phase, key, 0)) for key in spec.keys)
+            )
+            if spec.check is not None:
+                spec.check(dict(params))
+        except ValueError as exc:
+            raise ValueError(f"Utilisation phase '{name}': {exc}") from None
+
+        minimum = _as_float(phase, "min", 0) if "min" in phase else None
+        maximum = _as_float(phase, "max", 0) if "max" in phase else None
+        if minimum is not None and maximum is not None and minimum > maximum:
+            raise ValueError(f"Utilisation phase '{name}' has min greater than max.")
+
+        phases.append(
+            UtilisationPhase(
+                name=str(name),
+                after_day=after_day,
+                distribution=distribution,
+                params=params,
+                minimum=minimum,
+                maximum=maximum,
+            )
+        )
+        previous_day = after_day
+    return tuple(phases)
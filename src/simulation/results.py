@@ -1,4 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from .counter_index import NO_DAY, CounterIndex
+
+KPI_COLUMNS = (
+    "completed",
+    "late_completions",
+    "mean_counter_variance",
+    "mean_abs_counter_variance",
+    "mean_lead_days",
+)
+
+
 def summarize_results(df):
     """Print summary statistics of simulation results."""
     print("\nSimulation Results Summary:")
     print(df.describe())
+
+
+def simulation_kpis(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute per-simulation KPIs from a work-order result frame.
+
+    Counter variance is `completion_counter - next_planned_counter` for
+    completed work orders; a late completion is one with positive variance.
+    Simulations without completions get NaN averages.
+    """
+    if df.empty or "simulation" not in df.columns:
+        return pd.DataFrame(
+            columns=list(KPI_COLUMNS), index=pd.Index([], name="simulation")
+        )
+
+    simulations = pd.Index(df["simulation"].unique(), name="simulation")
+    completed_df = df[df["completion"] == True]
+
+    variance = completed_df["completion_counter"].astype(float) - completed_df[
+        "next_planned_counter"
+    ].astype(float)
+    lead_days = completed_df["completion_day"].astype(float) - completed_df[
+        "call_day"
+    ].astype(float)
+    grouped = pd.DataFrame(
+        {
+            "simulation": completed_df["simulation"],
+            "variance": variance,
+            "abs_variance": variance.abs(),
+            "late": variance > 0,
+            "lead_days": lead_days,
+        }
+    ).groupby("simulation")
+
+    kpis = pd.DataFrame(
+        {
+            "completed": grouped.size(),
+            "late_completions": grouped["late"].sum(),
+            "mean_counter_variance": grouped["variance"].mean(),
+            "mean_abs_counter_variance": grouped["abs_variance"].mean(),
+            "mean_lead_days": grouped["lead_days"].mean(),
+        }
+    ).reindex(simulations)
+    kpis[["completed", "late_completions"]] = (
+        kpis[["completed", "late_completions"]].fillna(0).astype(int)
+    )
+    return kpis
+
+
+def planned_vs_actual_days(df: pd.DataFrame, index: CounterIndex) -> pd.DataFrame:
+    """
+    Compare completion days with the day each planned counter was reached.
+
+    Returns the completed rows of a work-order result frame with
+    `planned_counter_day` (first day the simulation's cumulative counter
+    exceeded `next_planned_counter`, NaN if it never did) and
+    `days_after_planned_counter` (`completion_day - planned_counter_day`;
+    positive means completed after the counter passed the plan). The
+    `simulation` column is matched to the index's simulation ids
+    (`CounterIndex.lanes_of`), so chunked results need not start at 0.
+    """
+    completed_df = df[df["completion"] == True].copy()
+    lanes = index.lanes_of(completed_df["simulation"].to_numpy(dtype=np.int64))
+    thresholds = completed_df["next_planned_counter"].to_numpy(dtype=np.float64)
+    days = index.first_crossing_days(thresholds[:, None], lanes)[:, 0].astype(float)
+    days[days == NO_DAY] = np.nan
+    completed_df["planned_counter_day"] = days
+    completed_df["days_after_planned_counter"] = (
+        completed_df["completion_day"].astype(float) - days
+    )
+    return completed_df
@@ -0,0 +1,484 @@
+import json
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.utils.resources import format_bytes, peak_rss_bytes
+
+from .backends import get_backend
+from .compact import COMPACT_COUNTER_DTYPE
+from .config_loader import generate_parameter_grid
+from .counters import (
+    build_counter_arrays,
+    build_fleet_counter_arrays,
+    load_counter_arrays,
+    save_counter_arrays,
+)
+from .fleet import FleetResult, is_fleet_config, run_batched_simulation, simulate_lanes
+from .memory import MemoryBudgetError, MemoryTracker, PhaseMemory, RunPlan, plan_run
+from .parameters import ParameterSet, compile_parameters
+from .sinks import SINK_FORMATS, SUCCESS_MARKER, ResultSink, is_complete
+
+RUN_FILE = "run.json"
+
+_worker_counters: np.ndarray | None = None
+
+
+@dataclass
+class RunStats:
+    """Throughput and resource figures for a batch run."""
+
+    parameter_sets: int
+    skipped: int
+    simulations: int
+    events: int
+    rows: int
+    elapsed_seconds: float
+    peak_rss_bytes: int | None
+    worker_peak_rss_bytes: int | None = None
+    plan: RunPlan | None = None
+    memory_phases: list[PhaseMemory] = field(default_factory=list)
+
+    @property
+    def simulations_per_second(self) -> float:
+        return self.simulations / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def summary(self) -> str:
+        """Human-readable end-of-run summary."""
+        lines = [
+            f"Ran {self.parameter_sets} parameter set(s), {self.simulations} "
+            f"simulation run(s), {self.rows} work-order row(s) in "
+            f"{self.elapsed_seconds:,.2f} s ({self.skipped} skipped on resume)",
+            f"Throughput: {self.simulations_per_second:,.2f} simulations/s, "
+            f"{self.events_per_second:,.2f} events/s",
+            f"Peak memory: {format_bytes(self.peak_rss_bytes)} "
+            f"(largest worker: {format_bytes(self.worker_peak_rss_bytes)})",
+        ]
+        if self.plan is not None:
+            estimate = self.plan.worker or self.plan.main
+            lines.append(
+                f"Plan: {self.plan.workers} worker(s), chunks of "
+                f"{self.plan.chunk_size} simulation(s), estimated peak "
+                f"{format_bytes(estimate.peak_bytes)} per process"
+            )
+        if self.memory_phases:
+            lines.append("Memory by phase:")
+            lines.append(MemoryTracker(phases=self.memory_phases).summary())
+        return "\n".join(lines)
+
+
+def select_parameter_sets(
+    parameters: dict[str, Any],
+    sweep: bool = False,
+    sample: int | None = None,
+    sample_method: str = "random",
+    seed: int | None = None,
+) -> list[tuple[int, dict[str, Any]]]:
+    """
+    Pick parameter combinations to run as `(combination_id, config)` pairs.
+
+    Defaults to the first combination; `sweep` selects all of them and
+    `sample` draws that many combination ids from the lazy grid.
+    """
+    grid = generate_parameter_grid(parameters)
+    if sample is not None:
+        ids = sorted(grid.sample(sample, method=sample_method, seed=seed))
+    elif sweep:
+        ids = range(len(grid))
+    else:
+        ids = range(min(len(grid), 1))
+    return [(combination_id, grid[combination_id]) for combination_id in ids]
+
+
+def _check_budget(memory_budget: int | None) -> None:
+    if memory_budget is None:
+        return
+    peak = peak_rss_bytes()
+    if peak is not None and peak > memory_budget:
+        raise MemoryBudgetError(
+            f"Peak memory {format_bytes(peak)} exceeded the budget of "
+            f"{format_bytes(memory_budget)}."
+        )
+
+
+def _run_parameter_set(
+    combination_id: int,
+    params: ParameterSet,
+    backend: str,
+    output_dir: str,
+    sink_format: str,
+    chunk_size: int | None,
+    memory_budget: int | None,
+    compact: bool = False,
+    counters: np.ndarray | None = None,
+) -> tuple[int, int, int]:
+    """
+    Run one parameter set chunk by chunk; returns (simulations, events, rows).
+
+    `counters` are stacked (2, num_simulations, num_days) arrays, the worker's
+    memory map when None. The batched backend runs on array slices and only
+    builds frames for the sink; other backends get a `counter_frame` per chunk.
+    """
+    if counters is None:
+        counters = _worker_counters
+    run = get_backend(backend)
+    num_simulations = counters.shape[1]
+    step = chunk_size or num_simulations
+
+    sink = ResultSink(output_dir, combination_id, sink_format, compact)
+    events = 0
+    for start in range(0, num_simulations, step):
+        stop = min(start + step, num_simulations)
+        chunk = counters[:, start:stop]
+        if run is run_batched_simulation:
+            work_orders = simulate_lanes(chunk[0], chunk[1], params)
+            if work_orders is None:
+                from .montecarlo import build_work_order_schedule
+
+                sink.write(build_work_order_schedule(params))
+            else:
+                events += int(work_orders.called.sum()) + int(
+                    work_orders.completion.sum()
+                )
+                sink.write_work_orders(
+                    work_orders, {"simulation": np.arange(start, stop)}
+                )
+            del work_orders
+        else:
+            from .montecarlo import counter_frame
+
+            result_df = run(counter_frame(chunk, start), params)
+            if not result_df.empty:
+                events += int(result_df["called"].sum()) + int(
+                    result_df["completion"].sum()
+                )
+            sink.write(result_df)
+            del result_df
+        _check_budget(memory_budget)
+    sink.close()
+    return num_simulations, events, sink.rows
+
+
+def _run_fleet_parameter_set(
+    combination_id: int,
+    params: ParameterSet,
+    fleet_counters: tuple[tuple[str, ...], np.ndarray, np.ndarray],
+    output_dir: str,
+    sink_format: str,
+    chunk_size: int | None,
+    memory_budget: int | None,
+    compact: bool = False,
+) -> tuple[int, int, int]:
+    """Run one parameter set across every fleet lane; returns (simulations, events, rows)."""
+    asset_names, utilisation, cumulative = fleet_counters
+    num_simulations, num_assets, num_days = utilisation.shape
+    step = chunk_size or num_simulations
+
+    sink = ResultSink(output_dir, combination_id, sink_format, compact)
+    events = 0
+    for start in range(0, num_simulations, step):
+        stop = min(start + step, num_simulations)
+        lanes = (stop - start) * num_assets
+        work_orders = simulate_lanes(
+            utilisation[start:stop].reshape(lanes, num_days),
+            cumulative[start:stop].reshape(lanes, num_days),
+            params,
+        )
+        if work_orders is None:
+            break
+        events += int(work_orders.called.sum()) + int(work_orders.completion.sum())
+        fleet_result = FleetResult(asset_names, stop - start, work_orders)
+        sink.write_work_orders(work_orders, fleet_result.lane_columns(start))
+        del fleet_result, work_orders
+        _check_budget(memory_budget)
+    sink.close()
+    return num_simulations * num_assets, events, sink.rows
+
+
+def _init_worker(counter_path: str) -> None:
+    global _worker_counters
+    _worker_counters = load_counter_arrays(counter_path)
+
+
+def _validate_options(sink_format: str, chunk_size: int | None, backend: str) -> None:
+    if sink_format not in SINK_FORMATS:
+        raise ValueError(f"Unsupported sink format: {sink_format}")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    get_backend(backend)
+
+
+def _run_record(
+    config: dict[str, Any],
+    seed: int | None,
+    compact: bool,
+    selected: list[tuple[int, dict[str, Any]]],
+) -> dict[str, Any]:
+    # Everything that decides a parameter set's results, as JSON would store it
+    return json.loads(
+        json.dumps(
+            {
+                "seed": seed,
+                "compact": compact,
+                "config": config,
+                "parameter_sets": [combination_id for combination_id, _ in selected],
+            }
+        )
+    )
+
+
+def _check_resume(output_path: Path, record: dict[str, Any]) -> None:
+    if record["seed"] is None:
+        raise ValueError(
+            "Resuming needs a seed: an unseeded run draws different utilisation "
+            "paths (and samples) than the run being resumed."
+        )
+    run_file = output_path / RUN_FILE
+    if not run_file.exists():
+        if any(output_path.glob(f"parameter_set_*/{SUCCESS_MARKER}")):
+            raise ValueError(
+                f"Cannot resume in {output_path}: it has completed parameter sets "
+                f"but no {RUN_FILE} to check them against."
+            )
+        return
+    stored = json.loads(run_file.read_text(encoding="utf-8"))
+    differing = [key for key in record if stored.get(key) != record[key]]
+    if differing:
+        raise ValueError(
+            f"Cannot resume in {output_path}: {', '.join(differing)} differ from "
+            f"the run recorded in {RUN_FILE}."
+        )
+
+
+def _compile_selection(
+    config: dict[str, Any],
+    sweep: bool,
+    sample: int | None,
+    sample_method: str,
+    seed: int | None,
+) -> tuple[list[tuple[int, dict[str, Any]]], list[tuple[int, ParameterSet]]]:
+    selected = select_parameter_sets(
+        config["parameters"], sweep, sample, sample_method, seed
+    )
+    compiled = [
+        (combination_id, compile_parameters(parameter_config))
+        for combination_id, parameter_config in selected
+    ]
+    return selected, compiled
+
+
+def plan_batch(
+    config: dict[str, Any],
+    seed: int | None = None,
+    workers: int = 1,
+    backend: str = "reference",
+    sink_format: str = "csv",
+    sweep: bool = False,
+    sample: int | None = None,
+    sample_method: str = "random",
+    chunk_size: int | None = None,
+    memory_budget: int | None = None,
+    compact: bool = False,
+) -> RunPlan:
+    """
+    Estimate peak memory for a `run_batch` call without running it.
+
+    Returns the workers and chunk size `run_batch` would use; raises
+    `MemoryBudgetError` when the run would be refused.
+    """
+    _validate_options(sink_format, chunk_size, backend)
+    _, compiled = _compile_selection(config, sweep, sample, sample_method, seed)
+    return plan_run(
+        config,
+        [params for _, params in compiled],
+        memory_budget,
+        workers,
+        chunk_size,
+        backend,
+        sink_format,
+        compact,
+    )
+
+
+def run_batch(
+    config: dict[str, Any],
+    output_dir: str | Path,
+    seed: int | None = None,
+    workers: int = 1,
+    backend: str = "reference",
+    sink_format: str = "csv",
+    sweep: bool = False,
+    sample: int | None = None,
+    sample_method: str = "random",
+    resume: bool = False,
+    chunk_size: int | None = None,
+    memory_budget: int | None = None,
+    compact: bool = False,
+    trace_allocations: bool = False,
+) -> RunStats:
+    """
+    Run parameter sets headlessly and stream results to a sink.
+
+    All inputs are validated before counters are generated. Counters are built
+    once and shared by every parameter set (memory-mapped when `workers > 1`).
+    With `resume`, sets that already have a `_SUCCESS` marker are skipped;
+    resuming needs a `seed`, and the seed, config, `compact` and selected
+    combinations must match the run recorded in `output_dir/run.json`
+    (`ValueError` otherwise, before anything runs).
+    With `memory_budget` (bytes), peak memory is estimated first: `workers`
+    and `chunk_size` become upper bounds and are lowered until the estimate
+    fits, or `MemoryBudgetError` is raised before anything runs. Workers share
+    what the main process's estimate leaves of the budget. At runtime each
+    process stops with `MemoryBudgetError` once its own peak RSS exceeds its
+    share (a per-process check, not a check on the combined RSS).
+    Counters stay numpy arrays: with the `batched` backend and the `none`
+    sink, neither the main process nor the workers import pandas.
+    Fleet configs (`assets` or `num_assets`) run every asset through the
+    batched engine in-process, whatever `backend` and `workers` say.
+    With `compact`, counters are float32 and results are written with
+    compact dtypes (see `src/simulation/compact.py` for precision).
+    With `trace_allocations`, per-phase memory also reports `tracemalloc` peaks.
+    """
+    started = time.perf_counter()
+    _validate_options(sink_format, chunk_size, backend)
+    selected, compiled = _compile_selection(config, sweep, sample, sample_method, seed)
+    output_path = Path(output_dir)
+    record = _run_record(config, seed, compact, selected)
+    if resume:
+        _check_resume(output_path, record)
+    pending = [
+        (combination_id, params)
+        for combination_id, params in compiled
+        if not (resume and is_complete(output_dir, combination_id))
+    ]
+
+    plan = None
+    if pending:
+        plan = plan_run(
+            config,
+            [params for _, params in pending],
+            memory_budget,
+            workers,
+            chunk_size,
+            backend,
+            sink_format,
+            compact,
+        )
+        if memory_budget is not None:
+            workers, chunk_size = plan.workers, plan.chunk_size
+    process_budget = plan.process_budget if plan is not None else memory_budget
+    tracker = MemoryTracker(trace_allocations)
+
+    output_path.mkdir(parents=True, exist_ok=True)
+    if sink_format != "none":
+        (output_path / "parameter_sets.json").write_text(
+            json.dumps(
+                {str(combination_id): cfg for combination_id, cfg in selected},
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        (output_path / RUN_FILE).write_text(
+            json.dumps(record, indent=2), encoding="utf-8"
+        )
+
+    if seed is not None:
+        np.random.seed(seed)
+
+    totals = [0, 0, 0]
+    if is_fleet_config(config):
+        workers = 1
+        if pending:
+            with tracker.phase("counters"):
+                fleet_counters = build_fleet_counter_arrays(config)
+                if compact:
+                    asset_names, utilisation, cumulative = fleet_counters
+                    fleet_counters = (
+                        asset_names,
+                        utilisation.astype(COMPACT_COUNTER_DTYPE),
+                        cumulative.astype(COMPACT_COUNTER_DTYPE),
+                    )
+        for combination_id, params in pending:
+            with tracker.phase(f"parameter set {combination_id}"):
+                result = _run_fleet_parameter_set(
+                    combination_id,
+                    params,
+                    fleet_counters,
+                    str(output_path),
+                    sink_format,
+                    chunk_size,
+                    process_budget,
+                    compact,
+                )
+            totals = [total + value for total, value in zip(totals, result)]
+        pending_counters = []
+    else:
+        pending_counters = pending
+
+    counters = None
+    if pending_counters:
+        with tracker.phase("counters"):
+            counter_dtype = COMPACT_COUNTER_DTYPE if compact else np.float64
+            counters = np.stack(build_counter_arrays(config)).astype(
+                counter_dtype, copy=False
+            )
+    common_args = (
+        backend,
+        str(output_path),
+        sink_format,
+        chunk_size,
+        process_budget,
+        compact,
+    )
+    if workers <= 1:
+        for combination_id, params in pending_counters:
+            with tracker.phase(f"parameter set {combination_id}"):
+                result = _run_parameter_set(
+                    combination_id, params, *common_args, counters=counters
+                )
+            totals = [total + value for total, value in zip(totals, result)]
+    elif pending_counters:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            counter_path = save_counter_arrays(
+                counters, Path(temp_dir) / "counter_data.npy"
+            )
+            del counters
+            with tracker.phase("workers"), ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(str(counter_path),),
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _run_parameter_set, combination_id, params, *common_args
+                    )
+                    for combination_id, params in pending_counters
+                ]
+                for future in futures:
+                    result = future.result()
+                    totals = [total + value for total, value in zip(totals, result)]
+
+    simulations, events, rows = totals
+    return RunStats(
+        parameter_sets=len(pending),
+        skipped=len(compiled) - len(pending),
+        simulations=simulations,
+        events=events,
+        rows=rows,
+        elapsed_seconds=time.perf_counter() - started,
+        peak_rss_bytes=peak_rss_bytes(),
+        worker_peak_rss_bytes=(
+            peak_rss_bytes(include_children=True) if workers > 1 else None
+        ),
+        plan=plan,
+        memory_phases=tracker.phases,
+    )
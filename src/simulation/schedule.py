@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .parameters import ParameterSet, compile_parameters
+
+CALLS_PER_ITEM = 24
+
+
+@dataclass(frozen=True)
+class WorkOrderSchedule:
+    """
+    Planned work-order rows of a parameter set, as numpy columns.
+
+    Rows are in call order. `item_codes` index `item_names`, which are in
+    order of first appearance. Only needs numpy, so the array engine and
+    memory planning can build schedules without importing pandas.
+    """
+
+    item_names: tuple[str, ...]
+    item_codes: np.ndarray
+    cycle: np.ndarray
+    call_number: np.ndarray
+    next_planned_counter: np.ndarray
+    annual_estimate: float
+    units_prior_for_call: float
+
+    @property
+    def num_rows(self) -> int:
+        return self.cycle.size
+
+    @property
+    def items(self) -> np.ndarray:
+        return np.asarray(self.item_names, dtype=object)[self.item_codes]
+
+    @property
+    def call_counter(self) -> np.ndarray:
+        return self.next_planned_counter - self.units_prior_for_call
+
+
+def build_schedule(
+    parameter_config: dict[str, Any] | ParameterSet,
+) -> WorkOrderSchedule | None:
+    """
+    Build the work-order schedule of a parameter set (None without items).
+
+    Each item is planned `CALLS_PER_ITEM` times at multiples of its cycle.
+    Rows are ordered by planned counter; with suppression only the longest
+    cycle is kept at each counter. The schedule stops before the last call
+    of the shortest cycle.
+    """
+    params = compile_parameters(parameter_config)
+    if not params.items:
+        return None
+
+    names = [item for item, _ in params.items]
+    cycles = np.array([cycle for _, cycle in params.items], dtype=np.float64)
+    codes = np.repeat(np.arange(len(names)), CALLS_PER_ITEM)
+    cycle = np.repeat(cycles, CALLS_PER_ITEM)
+    # Accumulate cycle by cycle, as repeated addition rounds differently to k * cycle
+    counter = np.add.accumulate(
+        np.tile(cycles[:, None], (1, CALLS_PER_ITEM)), axis=1
+    ).reshape(-1)
+
+    if params.suppressed:
+        order = np.lexsort((-cycle, counter))
+        counter, cycle, codes = counter[order], cycle[order], codes[order]
+        first = np.ones(counter.size, dtype=bool)
+        first[1:] = counter[1:] != counter[:-1]
+        counter, cycle, codes = counter[first], cycle[first], codes[first]
+    else:
+        name_rank = np.argsort(np.argsort(np.asarray(names, dtype=object)))
+        order = np.lexsort((name_rank[codes], cycle, counter))
+        counter, cycle, codes = counter[order], cycle[order], codes[order]
+
+    last = np.flatnonzero(cycle == cycle.min())[-1]
+    counter, cycle, codes = counter[:last], cycle[:last], codes[:last]
+
+    # Re-code items by first appearance in the schedule
+    used, first_seen, codes = np.unique(codes, return_index=True, return_inverse=True)
+    appearance = np.argsort(first_seen)
+    recode = np.empty_like(appearance)
+    recode[appearance] = np.arange(appearance.size)
+
+    return WorkOrderSchedule(
+        item_names=tuple(names[code] for code in used[appearance]),
+        item_codes=recode[codes].astype(np.intp),
+        cycle=cycle,
+        call_number=np.arange(1, counter.size + 1, dtype=np.int64),
+        next_planned_counter=counter,
+        annual_estimate=params.annual_estimate,
+        units_prior_for_call=params.units_prior_for_call,
+    )
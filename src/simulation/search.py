@@ -0,0 +1,103 @@
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+import pandas as pd
+
+from .montecarlo import run_simulation
+from .parameters import compile_parameters
+from .results import KPI_COLUMNS, simulation_kpis
+
+
+@dataclass
+class HalvingRound:
+    """Scores for one successive-halving round."""
+
+    round_index: int
+    num_simulations: int
+    scores: dict[int, float]
+
+
+@dataclass
+class SearchResult:
+    """Outcome of a successive-halving search."""
+
+    objective: str
+    maximise: bool
+    best_index: int
+    best_config: dict[str, Any]
+    best_score: float
+    rounds: list[HalvingRound] = field(default_factory=list)
+
+
+def _rank_key(score: float, maximise: bool) -> float:
+    if math.isnan(score):
+        return math.inf
+    return -score if maximise else score
+
+
+def successive_halving(
+    counter_df: pd.DataFrame,
+    candidates: list[dict[str, Any]],
+    objective: str = "mean_abs_counter_variance",
+    maximise: bool = False,
+    min_simulations: int = 1,
+    eta: int = 2,
+) -> SearchResult:
+    """
+    Search parameter sets by successive halving.
+
+    Every candidate starts on the first `min_simulations` simulations of
+    `counter_df`. After each round the best `1 / eta` of candidates (by the
+    mean of the per-simulation KPI `objective`) survive and their simulation
+    budget grows by `eta`, capped at the simulations available. Survivors
+    only run the simulations they have not seen yet, so KPIs from earlier
+    rounds and the shared counter data are reused.
+    """
+    if objective not in KPI_COLUMNS:
+        raise ValueError(f"Unsupported objective: {objective}")
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    if not candidates:
+        raise ValueError("No candidate parameter sets were provided.")
+
+    compiled = [compile_parameters(candidate) for candidate in candidates]
+    simulation_ids = list(counter_df.index.get_level_values("simulation").unique())
+    max_simulations = len(simulation_ids)
+    budget = min(max(min_simulations, 1), max_simulations)
+
+    survivors = list(range(len(candidates)))
+    kpis: dict[int, list[pd.DataFrame]] = {index: [] for index in survivors}
+    completed_runs = {index: 0 for index in survivors}
+    rounds: list[HalvingRound] = []
+
+    while True:
+        scores: dict[int, float] = {}
+        for index in survivors:
+            start = completed_runs[index]
+            if start < budget:
+                counter_slice = counter_df.loc[simulation_ids[start:budget]]
+                result_df = run_simulation(
+                    counter_slice, compiled[index], export_csv=False
+                )
+                kpis[index].append(simulation_kpis(result_df))
+                completed_runs[index] = budget
+            scores[index] = float(pd.concat(kpis[index])[objective].mean())
+
+        rounds.append(HalvingRound(len(rounds), budget, scores))
+        survivors.sort(key=lambda index: _rank_key(scores[index], maximise))
+        if len(survivors) == 1 or budget == max_simulations:
+            break
+
+        survivors = survivors[: math.ceil(len(survivors) / eta)]
+        budget = min(budget * eta, max_simulations)
+
+    best_index = survivors[0]
+    return SearchResult(
+        objective=objective,
+        maximise=maximise,
+        best_index=best_index,
+        best_config=candidates[best_index],
+        best_score=rounds[-1].scores[best_index],
+        rounds=rounds,
+    )
@@ -0,0 +1,506 @@
+import asyncio
+import contextlib
+import json
+import math
+import tempfile
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .backends import get_backend
+from .common_random import load_counter_data, save_counter_data
+from .fleet import is_fleet_config
+from .montecarlo import build_counter_data
+from .parameters import ParameterSet, compile_parameters, compile_utilisation_phases
+from .results import KPI_COLUMNS, simulation_kpis
+from .runner import select_parameter_sets
+
+JOB_KINDS = ("run", "sweep")
+FINISHED_STATES = ("done", "failed")
+
+
+@lru_cache(maxsize=4)
+def _counter_data(counter_path: str) -> pd.DataFrame:
+    return load_counter_data(counter_path)
+
+
+def _warm_worker() -> int:
+    # Runs once per pool process so the first job does not pay for imports
+    get_backend("reference")
+    return 0
+
+
+def _build_counters(config: dict[str, Any], seed: int | None, counter_path: str) -> str:
+    # A local generator leaves the warm worker's global state alone, so later
+    # unseeded jobs on this worker still draw fresh paths
+    rng = np.random.default_rng(seed)
+    save_counter_data(build_counter_data(config, rng=rng), counter_path)
+    return counter_path
+
+
+def _run_chunk(
+    counter_path: str, start: int, stop: int, params: ParameterSet, backend: str
+) -> pd.DataFrame:
+    chunk_df = _counter_data(counter_path).loc[start : stop - 1]
+    return simulation_kpis(get_backend(backend)(chunk_df, params))
+
+
+def counter_key(config: dict[str, Any], seed: int | None) -> str | None:
+    """
+    Identify the counter data a job needs, or None when it is not repeatable.
+
+    Jobs without a seed draw fresh utilisation paths, so they are never
+    deduplicated or served from the result cache.
+    """
+    if seed is None:
+        return None
+    return json.dumps(
+        {
+            "num_simulations": config["num_simulations"],
+            "num_days": config["num_days"],
+            "daily_utilisations": config["daily_utilisations"],
+            "seed": seed,
+        },
+        sort_keys=True,
+        default=str,
+    )
+
+
+def _json_number(value: Any) -> float | int | None:
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+@dataclass
+class Job:
+    """A submitted run or sweep, with its status and KPIs received so far."""
+
+    job_id: str
+    kind: str
+    parameter_sets: list[tuple[int, ParameterSet]]
+    num_simulations: int
+    status: str = "queued"
+    error: str | None = None
+    cached: int = 0
+    kpis: dict[int, list[pd.DataFrame]] = field(default_factory=dict)
+    version: int = 0
+    key: tuple | None = field(default=None, repr=False)
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def total_simulations(self) -> int:
+        return len(self.parameter_sets) * self.num_simulations
+
+    @property
+    def completed_simulations(self) -> int:
+        return sum(len(frame) for frames in self.kpis.values() for frame in frames)
+
+    def add_kpis(self, combination_id: int, kpis: pd.DataFrame) -> None:
+        self.kpis.setdefault(combination_id, []).append(kpis)
+        self._notify()
+
+    def set_status(self, status: str, error: str | None = None) -> None:
+        self.status = status
+        self.error = error
+        self._notify()
+
+    def _notify(self) -> None:
+        self.version += 1
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def changed(self) -> None:
+        """Wait for the next status change or partial result."""
+        await self._changed.wait()
+
+    def result(self) -> pd.DataFrame:
+        """Per-simulation KPIs received so far, indexed by (`parameter_set`, `simulation`)."""
+        if not self.kpis:
+            return pd.DataFrame(columns=list(KPI_COLUMNS))
+        return pd.concat(
+            {
+                combination_id: pd.concat(frames).sort_index()
+                for combination_id, frames in sorted(self.kpis.items())
+            },
+            names=["parameter_set"],
+        )
+
+    def aggregates(self) -> pd.DataFrame:
+        """Mean KPIs per parameter set over the simulations received so far."""
+        kpis = self.result()
+        if kpis.empty:
+            return pd.DataFrame(
+                columns=["simulations", *KPI_COLUMNS],
+                index=pd.Index([], name="parameter_set"),
+            )
+        grouped = kpis.astype(float).groupby(level="parameter_set")
+        return grouped.mean().assign(simulations=grouped.size())[
+            ["simulations", *KPI_COLUMNS]
+        ]
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-safe status with the current partial aggregates."""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "error": self.error,
+            "parameter_sets": [
+                combination_id for combination_id, _ in self.parameter_sets
+            ],
+            "cached_parameter_sets": self.cached,
+            "completed_simulations": self.completed_simulations,
+            "total_simulations": self.total_simulations,
+            "aggregates": {
+                str(combination_id): {
+                    column: _json_number(value) for column, value in row.items()
+                }
+                for combination_id, row in self.aggregates().iterrows()
+            },
+        }
+
+
+class SimulationService:
+    """
+    Long-lived job queue over a warm process pool.
+
+    Jobs are scheduled from an asyncio event loop; simulations run in a
+    persistent `ProcessPoolExecutor`. Counter data is built once per
+    (utilisation config, seed) and memory-mapped by the workers. Seeded
+    jobs are deduplicated: an identical job returns the existing job, and
+    each parameter set's KPIs are cached so overlapping sweeps reuse them.
+
+    Everything kept between jobs is bounded, least recently used first out:
+    at most `max_finished_jobs` finished jobs, `max_cached_results` cached
+    parameter-set KPIs and `max_counter_files` seeded counter files (a file
+    is deleted when evicted; files in use by a running job are kept).
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        backend: str = "batched",
+        chunk_size: int | None = None,
+        max_finished_jobs: int = 256,
+        max_cached_results: int = 1024,
+        max_counter_files: int = 8,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be positive")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        if min(max_finished_jobs, max_cached_results, max_counter_files) < 1:
+            raise ValueError("cache limits must be positive")
+        get_backend(backend)
+        self.workers = workers
+        self.backend = backend
+        self.chunk_size = chunk_size
+        self.max_finished_jobs = max_finished_jobs
+        self.max_cached_results = max_cached_results
+        self.max_counter_files = max_counter_files
+        self.jobs: dict[str, Job] = {}
+        self._jobs_by_key: dict[tuple, Job] = {}
+        self._finished_jobs: OrderedDict[str, None] = OrderedDict()
+        self._counters: OrderedDict[str, asyncio.Future] = OrderedDict()
+        self._counter_users: dict[str, int] = {}
+        self._results: OrderedDict[tuple, asyncio.Future] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+        self._executor: ProcessPoolExecutor | None = None
+        self._temp_dir: tempfile.TemporaryDirectory | None = None
+
+    async def __aenter__(self) -> "SimulationService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Start the worker processes and wait until every one is warm."""
+        self._temp_dir = tempfile.TemporaryDirectory(prefix="ahp-mp-sim-service-")
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, _warm_worker)
+                for _ in range(self.workers)
+            )
+        )
+
+    async def close(self) -> None:
+        """Cancel unfinished jobs, stop the workers and remove counter files."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+
+    def submit(
+        self,
+        config: dict[str, Any],
+        kind: str = "run",
+        seed: int | None = None,
+        sample: int | None = None,
+        sample_method: str = "random",
+    ) -> Job:
+        """
+        Queue a job and return it without waiting.
+
+        `run` jobs use the first parameter combination (or `sample` of them);
+        `sweep` jobs use every combination. Invalid jobs (including payloads
+        of the wrong JSON type, e.g. a string `seed`) raise `ValueError` here,
+        before anything is scheduled.
+        """
+        if self._executor is None:
+            raise RuntimeError("The service has not been started.")
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unsupported job kind: {kind}")
+        for name, value in (("seed", seed), ("sample", sample)):
+            if value is not None and (
+                isinstance(value, bool) or not isinstance(value, int)
+            ):
+                raise ValueError(f"'{name}' must be an integer or null, got {value!r}.")
+        if not isinstance(config, dict):
+            raise ValueError("Config must be a JSON object.")
+        if is_fleet_config(config):
+            raise ValueError("Fleet configs are not supported by the service.")
+        try:
+            num_simulations = config["num_simulations"]
+            num_days = config["num_days"]
+            parameters = config["parameters"]
+            dist_cfg = config["daily_utilisations"]
+        except KeyError as exc:
+            raise ValueError(f"Config is missing '{exc.args[0]}'.") from None
+        for name in ("num_simulations", "num_days"):
+            value = config[name]
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"'{name}' must be a positive integer, got {value!r}.")
+        for name in ("parameters", "daily_utilisations"):
+            if not isinstance(config[name], dict):
+                raise ValueError(f"'{name}' must be a JSON object.")
+
+        compile_utilisation_phases(dist_cfg, num_days)
+        try:
+            parameter_sets = [
+                (combination_id, compile_parameters(parameter_config))
+                for combination_id, parameter_config in select_parameter_sets(
+                    parameters, kind == "sweep", sample, sample_method, seed
+                )
+            ]
+        except (TypeError, AttributeError) as exc:
+            # Parameter values of the wrong JSON type (e.g. a list for `items`)
+            raise ValueError(f"Invalid parameters: {exc}") from None
+
+        counters = counter_key(config, seed)
+        job_key = (
+            (counters, self.backend, tuple(parameter_sets))
+            if counters is not None
+            else None
+        )
+        existing = self._jobs_by_key.get(job_key) if job_key else None
+        if existing is not None and existing.status != "failed":
+            return existing
+
+        job = Job(
+            job_id=uuid.uuid4().hex[:12],
+            kind=kind,
+            parameter_sets=parameter_sets,
+            num_simulations=num_simulations,
+            key=job_key,
+        )
+        self.jobs[job.job_id] = job
+        if job_key is not None:
+            self._jobs_by_key[job_key] = job
+        task = asyncio.get_running_loop().create_task(
+            self._run_job(job, config, seed, counters)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """Return the job called `job_id` (unknown once evicted)."""
+        try:
+            job = self.jobs[job_id]
+        except KeyError:
+            raise ValueError(f"Unknown job: {job_id}") from None
+        if job_id in self._finished_jobs:
+            self._finished_jobs.move_to_end(job_id)
+        return job
+
+    async def wait(self, job_id: str) -> Job:
+        """Wait until the job is done or failed."""
+        job = self.get(job_id)
+        while job.status not in FINISHED_STATES:
+            await job.changed()
+        return job
+
+    async def watch(self, job_id: str) -> AsyncIterator[dict[str, Any]]:
+        """Yield a snapshot now and after every update until the job finishes."""
+        job = self.get(job_id)
+        while True:
+            seen = job.version
+            yield job.snapshot()
+            if job.status in FINISHED_STATES:
+                return
+            while job.version == seen:
+                await job.changed()
+
+    async def _counter_path(
+        self, config: dict[str, Any], seed: int | None, counters: str | None
+    ) -> str:
+        loop = asyncio.get_running_loop()
+        if counters is not None and counters in self._counters:
+            self._counters.move_to_end(counters)
+            return await asyncio.shield(self._counters[counters])
+
+        counter_path = str(Path(self._temp_dir.name) / f"{uuid.uuid4().hex}.npy")
+        future = loop.run_in_executor(
+            self._executor, _build_counters, config, seed, counter_path
+        )
+        if counters is not None:
+            self._counters[counters] = future
+            self._evict_counters()
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            if self._counters.get(counters) is future:
+                del self._counters[counters]
+            raise
+
+    async def _parameter_set_kpis(
+        self,
+        job: Job,
+        combination_id: int,
+        params: ParameterSet,
+        counter_path: str,
+        counters: str | None,
+    ) -> None:
+        result_key = (counters, self.backend, params) if counters is not None else None
+        if result_key is not None and result_key in self._results:
+            self._results.move_to_end(result_key)
+            kpis = await asyncio.shield(self._results[result_key])
+            job.cached += 1
+            job.add_kpis(combination_id, kpis)
+            return
+
+        loop = asyncio.get_running_loop()
+        cached = loop.create_future()
+        if result_key is not None:
+            self._results[result_key] = cached
+            self._evict_results()
+        step = self.chunk_size or -(-job.num_simulations // self.workers)
+        chunks = [
+            loop.run_in_executor(
+                self._executor,
+                _run_chunk,
+                counter_path,
+                start,
+                min(start + step, job.num_simulations),
+                params,
+                self.backend,
+            )
+            for start in range(0, job.num_simulations, step)
+        ]
+        frames = []
+        try:
+            for chunk in asyncio.as_completed(chunks):
+                frame = await chunk
+                frames.append(frame)
+                job.add_kpis(combination_id, frame)
+        except Exception as exc:
+            self._results.pop(result_key, None)
+            cached.set_exception(exc)
+            # Mark the exception as retrieved; waiting jobs still receive it
+            cached.exception()
+            raise
+        except asyncio.CancelledError:
+            self._results.pop(result_key, None)
+            for chunk in chunks:
+                chunk.cancel()
+            cached.cancel()
+            raise
+        cached.set_result(pd.concat(frames).sort_index())
+
+    async def _run_job(
+        self,
+        job: Job,
+        config: dict[str, Any],
+        seed: int | None,
+        counters: str | None,
+    ) -> None:
+        job.set_status("running")
+        counter_path = None
+        if counters is not None:
+            self._counter_users[counters] = self._counter_users.get(counters, 0) + 1
+        try:
+            counter_path = await self._counter_path(config, seed, counters)
+            await asyncio.gather(
+                *(
+                    self._parameter_set_kpis(
+                        job, combination_id, params, counter_path, counters
+                    )
+                    for combination_id, params in job.parameter_sets
+                )
+            )
+        except asyncio.CancelledError:
+            job.set_status("failed", "cancelled")
+            raise
+        except Exception as exc:
+            job.set_status("failed", f"{type(exc).__name__}: {exc}")
+            return
+        finally:
+            if counters is None and counter_path is not None:
+                _remove_file(counter_path)
+            if counters is not None:
+                self._counter_users[counters] -= 1
+                if not self._counter_users[counters]:
+                    del self._counter_users[counters]
+                self._evict_counters()
+            self._finish(job)
+        job.set_status("done")
+
+    def _finish(self, job: Job) -> None:
+        self._finished_jobs[job.job_id] = None
+        while len(self._finished_jobs) > self.max_finished_jobs:
+            evicted = self.jobs.pop(self._finished_jobs.popitem(last=False)[0])
+            if evicted.key is not None and self._jobs_by_key.get(evicted.key) is evicted:
+                del self._jobs_by_key[evicted.key]
+
+    def _evict_results(self) -> None:
+        # Pending results stay: jobs are waiting on them
+        for result_key in list(self._results):
+            if len(self._results) <= self.max_cached_results:
+                return
+            if self._results[result_key].done():
+                del self._results[result_key]
+
+    def _evict_counters(self) -> None:
+        for counters in list(self._counters):
+            if len(self._counters) <= self.max_counter_files:
+                return
+            future = self._counters[counters]
+            if counters in self._counter_users or not future.done():
+                continue
+            del self._counters[counters]
+            if not future.cancelled() and future.exception() is None:
+                _remove_file(future.result())
+
+
+def _remove_file(path: str) -> None:
+    with contextlib.suppress(OSError):
+        Path(path).unlink()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .compact import compact_work_orders
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .fleet import BatchedWorkOrders
+
+SINK_FORMATS = ("csv", "parquet", "none")
+SUCCESS_MARKER = "_SUCCESS"
+
+
+class ResultSink:
+    """
+    Write one parameter set's work orders as numbered part files.
+
+    Parts land in `output_dir/parameter_set_<id>/part-<n>.<format>`. A
+    `_SUCCESS` marker is written on `close()`, so interrupted sets can be
+    detected and re-run when resuming. The `none` format discards results.
+    With `compact`, rows are written with `compact_work_orders` dtypes.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path,
+        parameter_set: int,
+        sink_format: str,
+        compact: bool = False,
+    ):
+        if sink_format not in SINK_FORMATS:
+            raise ValueError(f"Unsupported sink format: {sink_format}")
+        if sink_format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValueError(
+                    "The parquet sink requires pyarrow (uv pip install pyarrow)."
+                ) from None
+
+        self.sink_format = sink_format
+        self.compact = compact
+        self.directory = Path(output_dir) / f"parameter_set_{parameter_set:04d}"
+        self.parts = 0
+        self.rows = 0
+
+        if sink_format != "none":
+            if self.directory.exists():
+                shutil.rmtree(self.directory)
+            self.directory.mkdir(parents=True)
+
+    def write(self, work_order_df: pd.DataFrame) -> None:
+        """Append one chunk of work-order rows."""
+        self.rows += len(work_order_df)
+        if self.sink_format == "none":
+            return
+
+        destination = self.directory / f"part-{self.parts:05d}.{self.sink_format}"
+        if self.compact:
+            work_order_df = compact_work_orders(work_order_df)
+        if self.sink_format == "csv":
+            work_order_df.to_csv(destination, index=False)
+        else:
+            work_order_df.to_parquet(destination, index=False)
+        self.parts += 1
+
+    def write_work_orders(
+        self, work_orders: BatchedWorkOrders, lane_columns: dict[str, Any]
+    ) -> None:
+        """
+        Append one chunk of batched engine results.
+
+        The chunk is only expanded to a frame (`to_frame(lane_columns)`) when
+        it is written, so the `none` format never imports pandas.
+        """
+        if self.sink_format == "none":
+            self.rows += work_orders.num_lanes * work_orders.num_rows
+            return
+        self.write(work_orders.to_frame(lane_columns))
+
+    def close(self) -> None:
+        """Mark the parameter set as complete."""
+        if self.sink_format != "none":
+            (self.directory / SUCCESS_MARKER).touch()
+
+
+def is_complete(output_dir: str | Path, parameter_set: int) -> bool:
+    """Return True when a parameter set's results were fully written."""
+    directory = Path(output_dir) / f"parameter_set_{parameter_set:04d}"
+    return (directory / SUCCESS_MARKER).exists()
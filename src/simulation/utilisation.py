@@ -1,57 +1,59 @@
 import numpy as np
 
+from .distributions import get_distribution
+from .parameters import compile_utilisation_phases
+
+
+def _default_rng() -> np.random.Generator:
+    # Derive from numpy's global state so `np.random.seed` still makes runs repeatable
+    return np.random.default_rng(np.random.randint(0, 2**32, size=4, dtype=np.uint64))
+
+
 def generate_utilisation(
     dist_cfg: dict,
     num_simulations: int,
-    num_days: int
+    num_days: int,
+    num_assets: int | None = None,
+    rng: np.random.Generator | None = None,
 ):
     """
     Generate DAILY utilisation samples for all simulations, assets, and days.
     Supports multiple distributions starting at different days.
     Values are clipped to min and max if provided and rounded to 2 decimals.
-    Shape: (num_simulations, num_assets, num_days)
+    Shape: (num_simulations, num_assets, num_days) when `num_assets` is given,
+    otherwise (num_simulations, num_days).
+
+    Samples are drawn by the registered distribution samplers straight into a
+    day-major buffer, then clipped and rounded in place. The result is copied
+    once into contiguous (simulation, day) order, so flattening it later
+    (`build_counter_data`, fleet reshapes) does not copy again.
     """
-    # Initialise the array
-    utilisation = np.zeros((num_simulations, num_days))
-    
-    # Sort phases by starting day
-    phases = sorted(dist_cfg.values(), key=lambda x: x["after_day"])
-    
+    if num_assets is not None:
+        # Assets sharing one phase config are extra independent paths
+        flat = generate_utilisation(
+            dist_cfg, num_simulations * num_assets, num_days, rng=rng
+        )
+        return flat.reshape(num_simulations, num_assets, num_days)
+
+    # Validate phases before allocating anything
+    phases = compile_utilisation_phases(dist_cfg, num_days)
+    rng = rng if rng is not None else _default_rng()
+
+    # Day-major buffer: each phase is one contiguous block of days
+    buffer = np.zeros((num_days, num_simulations))
+
     for i, phase in enumerate(phases):
-        start_day = phase["after_day"]
-        end_day = phases[i + 1]["after_day"] if i + 1 < len(phases) else num_days
-        
-        dist = phase["distribution"]
-        
-        if dist == "normal":
-            vals = np.random.normal(
-                loc=phase["mean"],
-                scale=phase["std"],
-                size=(num_simulations, end_day - start_day)
-            )
-        elif dist == "uniform":
-            vals = np.random.uniform(
-                low=phase["min"],
-                high=phase["max"],
-                size=(num_simulations, end_day - start_day)
-            )
-        elif dist == "poisson":
-            vals = np.random.poisson(
-                lam=phase["lambda"],
-                size=(num_simulations, end_day - start_day)
-            )
-        else:
-            raise ValueError(f"Unsupported distribution: {dist}")
-        
+        start_day = phase.after_day
+        end_day = phases[i + 1].after_day if i + 1 < len(phases) else num_days
+        out = buffer[start_day:end_day]
+
+        get_distribution(phase.distribution).sample(dict(phase.params), rng, out)
+
         # Clip values if min/max are defined
-        min_val = phase.get("min", None)
-        max_val = phase.get("max", None)
-        if min_val is not None or max_val is not None:
-            vals = np.clip(vals, a_min=min_val, a_max=max_val)
-        
+        if phase.minimum is not None or phase.maximum is not None:
+            np.clip(out, phase.minimum, phase.maximum, out=out)
+
         # Round to 2 decimal places
-        vals = np.round(vals, 2)
-        
-        utilisation[:, start_day:end_day] = vals
-    
-    return utilisation
+        np.round(out, 2, out=out)
+
+    return np.ascontiguousarray(buffer.T)
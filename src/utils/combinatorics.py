@@ -1,12 +1,16 @@
 import itertools
+import math
+from collections.abc import Iterator
 from typing import Any
 
+import numpy as np
 
-def generate_dict_cartesian_product(
-    parameters: dict[str, Any],
-) -> list[dict[str, Any]]:
+SAMPLING_METHODS = ("random", "latin_hypercube", "sobol")
+
+
+def _split_options(parameters: dict[str, Any]) -> tuple[list[str], list[list[Any]]]:
     """
-    Build cartesian combinations from dict values.
+    Split a parameter dict into keys and option lists.
 
     Scalar values are treated as single-option lists.
     """
@@ -20,5 +24,107 @@ def generate_dict_cartesian_product(
         else:
             values.append([value])
 
-    all_combinations = itertools.product(*values)
-    return [dict(zip(keys, combo)) for combo in all_combinations]
+    return keys, values
+
+
+class ParameterGrid:
+    """
+    Lazy cartesian product over dict values.
+
+    Combinations are never materialised. Each combination has an integer id
+    that follows `itertools.product` order (last key varies fastest), so
+    `grid[i]` matches the i-th entry of `generate_dict_cartesian_product`.
+    """
+
+    def __init__(self, parameters: dict[str, Any]) -> None:
+        self.keys, self.options = _split_options(parameters)
+        self.sizes = tuple(len(option) for option in self.options)
+        self._size = math.prod(self.sizes)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for combo in itertools.product(*self.options):
+            yield dict(zip(self.keys, combo))
+
+    def __getitem__(self, index: int) -> dict[str, Any]:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(f"Combination id out of range: {index}")
+
+        combo: list[Any] = []
+        for option, size in zip(reversed(self.options), reversed(self.sizes)):
+            index, position = divmod(index, size)
+            combo.append(option[position])
+        return dict(zip(self.keys, reversed(combo)))
+
+    def combination_id(self, positions: list[int] | tuple[int, ...]) -> int:
+        """Encode per-key option positions into a combination id."""
+        combination_id = 0
+        for position, size in zip(positions, self.sizes):
+            combination_id = combination_id * size + int(position)
+        return combination_id
+
+    def sample(
+        self,
+        n: int,
+        method: str = "random",
+        seed: int | None = None,
+    ) -> list[int]:
+        """
+        Subsample combination ids without building the full grid.
+
+        `random` draws distinct ids uniformly. `latin_hypercube` and `sobol`
+        stratify over the keys that have more than one option; points falling
+        into the same grid cell are de-duplicated, so fewer than `n` ids may
+        be returned when a key has few options.
+        """
+        if method not in SAMPLING_METHODS:
+            raise ValueError(f"Unsupported sampling method: {method}")
+        if n <= 0 or self._size == 0:
+            return []
+        if n >= self._size:
+            return list(range(self._size))
+
+        if method == "random":
+            rng = np.random.default_rng(seed)
+            return [int(i) for i in rng.choice(self._size, size=n, replace=False)]
+
+        varying = [axis for axis, size in enumerate(self.sizes) if size > 1]
+        points = _unit_points(method, n, len(varying), seed)
+
+        ids: dict[int, None] = {}
+        positions = [0] * len(self.sizes)
+        for point in points:
+            for axis, value in zip(varying, point):
+                positions[axis] = min(
+                    int(value * self.sizes[axis]), self.sizes[axis] - 1
+                )
+            ids.setdefault(self.combination_id(positions), None)
+        return list(ids)
+
+
+def _unit_points(method: str, n: int, dimensions: int, seed: int | None) -> np.ndarray:
+    """Draw `n` stratified points in the unit hypercube."""
+    if method == "sobol":
+        from scipy.stats import qmc
+
+        sampler = qmc.Sobol(dimensions, scramble=True, seed=seed)
+        return sampler.random_base2(math.ceil(math.log2(n)))[:n]
+
+    rng = np.random.default_rng(seed)
+    strata = np.stack([rng.permutation(n) for _ in range(dimensions)], axis=1)
+    return (strata + rng.random((n, dimensions))) / n
+
+
+def generate_dict_cartesian_product(
+    parameters: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """
+    Build cartesian combinations from dict values.
+
+    Scalar values are treated as single-option lists.
+    """
+    return list(ParameterGrid(parameters))
@@ -0,0 +1,79 @@
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+def peak_rss_bytes(include_children: bool = False) -> int | None:
+    """
+    Return the peak resident set size of this process in bytes.
+
+    With `include_children`, the largest peak of any finished child process
+    is considered too. Reads `VmHWM` from `/proc/self/status` (Linux), since
+    `ru_maxrss` keeps the parent's peak across `exec`; elsewhere falls back
+    to `getrusage`. Returns None where neither is available.
+    """
+    peak = None
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    peak = int(line.split()[1]) * 1024
+                    break
+    except (OSError, IndexError, ValueError):
+        pass
+    if resource is None:
+        return peak
+
+    # Linux reports kilobytes, macOS reports bytes.
+    scale = 1 if sys.platform == "darwin" else 1024
+    if peak is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    if include_children:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        peak = max(peak, children * scale)
+    return peak
+
+
+def current_rss_bytes() -> int | None:
+    """
+    Return the current resident set size of this process in bytes.
+
+    Reads `/proc/self/statm` (Linux); elsewhere falls back to the peak RSS.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return peak_rss_bytes()
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def format_bytes(value: int | None) -> str:
+    """Format a byte count for humans (`-` when unknown)."""
+    if value is None:
+        return "-"
+    size = float(value)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:,.1f} {unit}"
+        size /= 1024
+    return f"{size:,.1f} GiB"
+
+
+def parse_bytes(value: str) -> int:
+    """Parse sizes such as `512M`, `2G` or `1048576` into bytes."""
+    text = value.strip().upper().removesuffix("B").removesuffix("I")
+    multipliers = {"K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+    multiplier = multipliers.get(text[-1:], 1)
+    number = text[:-1] if text[-1:] in multipliers else text
+    try:
+        parsed = float(number) * multiplier
+    except ValueError:
+        raise ValueError(f"Invalid size: {value!r}") from None
+    if parsed <= 0:
+        raise ValueError(f"Size must be positive: {value!r}")
+    return int(parsed)
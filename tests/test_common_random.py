@@ -0,0 +1,115 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.simulation.common_random import (
+    load_counter_data,
+    paired_differences,
+    run_common_random_sweep,
+    save_counter_data,
+)
+from src.simulation.montecarlo import build_counter_data
+
+
+class CommonRandomNumbersTests(unittest.TestCase):
+    def setUp(self) -> None:
+        np.random.seed(11)
+        config = {
+            "num_simulations": 3,
+            "num_days": 60,
+            "daily_utilisations": {
+                "base": {
+                    "after_day": 0,
+                    "distribution": "uniform",
+                    "min": 3,
+                    "max": 7,
+                }
+            },
+        }
+        self.counter_df = build_counter_data(config)
+        base = {
+            "package_cycle": 20,
+            "items": {"replace couplings": 20, "overhaul": 40},
+            "annual_estimate": 365,
+            "annual_estimate_recalculate_after_days": 7,
+            "suppressed": False,
+            "completion_requirement": False,
+            "early_shift_factors": 0,
+            "late_shift_factors": 0,
+        }
+        self.parameter_sets = [
+            {**base, "call_horizon_days": 1},
+            {**base, "call_horizon_days": 1},
+            {**base, "call_horizon_days": 5},
+        ]
+
+    def test_counter_data_round_trips_through_read_only_memmap(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = save_counter_data(self.counter_df, Path(temp_dir) / "counters.npy")
+            loaded = load_counter_data(path)
+
+            self.assertTrue(loaded.index.equals(self.counter_df.index))
+            np.testing.assert_array_equal(loaded.to_numpy(), self.counter_df.to_numpy())
+            self.assertFalse(loaded["utilisation"].to_numpy().flags.writeable)
+            del loaded
+
+    def test_sweep_matches_across_worker_counts(self) -> None:
+        serial = run_common_random_sweep(self.counter_df, self.parameter_sets)
+        parallel = run_common_random_sweep(
+            self.counter_df, self.parameter_sets, workers=2
+        )
+
+        self.assertEqual(set(serial.index.get_level_values("parameter_set")), {0, 1, 2})
+        self.assertTrue(serial.equals(parallel))
+
+    def test_counter_path_is_written_when_missing_and_used_serially(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "counters.npy"
+            persisted = run_common_random_sweep(
+                self.counter_df, self.parameter_sets, counter_path=path
+            )
+            np.testing.assert_array_equal(
+                load_counter_data(path).to_numpy(), self.counter_df.to_numpy()
+            )
+            parallel = run_common_random_sweep(
+                self.counter_df, self.parameter_sets, workers=2, counter_path=path
+            )
+
+        serial = run_common_random_sweep(self.counter_df, self.parameter_sets)
+        self.assertTrue(persisted.equals(serial))
+        self.assertTrue(parallel.equals(serial))
+
+    def test_existing_counter_path_must_match_counter_df(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "counters.npy"
+            save_counter_data(self.counter_df, path)
+            different = self.counter_df * 2
+            with self.assertRaisesRegex(ValueError, "different counter data"):
+                run_common_random_sweep(
+                    different, self.parameter_sets, counter_path=path
+                )
+            with self.assertRaisesRegex(ValueError, "different counter data"):
+                run_common_random_sweep(
+                    self.counter_df.astype(np.float32),
+                    self.parameter_sets,
+                    counter_path=path,
+                )
+            with self.assertRaisesRegex(ValueError, "different counter data"):
+                run_common_random_sweep(
+                    self.counter_df.loc[[0, 1]], self.parameter_sets, counter_path=path
+                )
+
+    def test_paired_differences_are_zero_for_identical_sets(self) -> None:
+        kpis = run_common_random_sweep(self.counter_df, self.parameter_sets)
+        diffs = paired_differences(kpis, baseline=0)
+
+        identical = diffs.xs(1, level="parameter_set")
+        self.assertTrue((identical["mean_difference"] == 0).all())
+        self.assertEqual(int(identical.loc["completed", "n"]), 3)
+        self.assertIn(2, diffs.index.get_level_values("parameter_set"))
+
+
+if __name__ == "__main__":
+    unittest.main()
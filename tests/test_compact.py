@@ -0,0 +1,97 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.simulation.compact import compact_work_orders, expand_work_orders
+from src.simulation.fleet import run_batched_simulation
+from src.simulation.montecarlo import build_counter_data
+from src.simulation.results import KPI_COLUMNS, simulation_kpis
+
+
+class CompactDtypeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = {
+            "num_simulations": 40,
+            "num_days": 300,
+            "daily_utilisations": {
+                "base": {
+                    "after_day": 0,
+                    "distribution": "normal",
+                    "mean": 20,
+                    "std": 6,
+                    "min": 0,
+                }
+            },
+        }
+        self.parameters = {
+            "package_cycle": 250,
+            "items": {"inspect": 250, "service": 500, "overhaul": 1000},
+            "annual_estimate": 7300,
+            "annual_estimate_recalculate_after_days": 30,
+            "suppressed": False,
+            "completion_requirement": True,
+            "early_shift_factors": 0.5,
+            "late_shift_factors": 0.5,
+            "call_horizon_days": 7,
+        }
+
+    def _counters(self, dtype) -> pd.DataFrame:
+        np.random.seed(3)
+        return build_counter_data(self.config, dtype=dtype)
+
+    def test_float32_counters_round_back_to_two_decimals(self) -> None:
+        full = self._counters(np.float64)
+        compact = self._counters(np.float32)
+
+        self.assertEqual(set(compact.dtypes), {np.dtype(np.float32)})
+        np.testing.assert_array_equal(
+            compact.to_numpy(dtype=np.float64).round(2), full.to_numpy().round(2)
+        )
+        self.assertLessEqual(compact.to_numpy().nbytes * 2, full.to_numpy().nbytes)
+
+    def test_compact_work_orders_round_trip_and_halve_memory(self) -> None:
+        result = run_batched_simulation(self._counters(np.float64), self.parameters)
+        compact = compact_work_orders(result)
+        restored = expand_work_orders(compact)
+
+        self.assertEqual(compact["item"].dtype, "category")
+        self.assertEqual(compact["call_day"].dtype, "Int32")
+        self.assertNotIn("called", compact.columns)
+        self.assertLessEqual(
+            compact.memory_usage(deep=True).sum() * 2,
+            result.memory_usage(deep=True).sum(),
+        )
+        self.assertEqual(list(restored.columns), list(result.columns))
+        for column in ("called", "completion", "open_work_orders"):
+            np.testing.assert_array_equal(restored[column], result[column])
+        pd.testing.assert_series_equal(
+            restored["completion_day"].astype(float), result["completion_day"]
+        )
+        np.testing.assert_allclose(
+            restored["completion_counter"], result["completion_counter"], rtol=1e-7
+        )
+
+    def test_kpi_drift_against_float64_stays_within_tolerance(self) -> None:
+        full = simulation_kpis(
+            run_batched_simulation(self._counters(np.float64), self.parameters)
+        )
+        compact = simulation_kpis(
+            expand_work_orders(
+                compact_work_orders(
+                    run_batched_simulation(self._counters(np.float32), self.parameters)
+                )
+            )
+        )
+
+        for kpi in KPI_COLUMNS:
+            expected = full[kpi].astype(float).mean()
+            actual = compact[kpi].astype(float).mean()
+            with self.subTest(kpi=kpi):
+                self.assertLessEqual(
+                    abs(actual - expected), 0.01 * max(1, abs(expected))
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+
+import numpy as np
+
+from src.simulation.counter_index import NO_DAY, CounterIndex
+from src.simulation.montecarlo import (
+    build_counter_data,
+    counter_frame,
+    run_simulation,
+)
+from src.simulation.results import planned_vs_actual_days
+
+
+class CounterIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cumulative = np.array(
+            [
+                [1.0, 2.0, 2.0, 5.0, 9.0],
+                [0.0, 4.0, 4.0, 4.0, 6.0],
+            ]
+        )
+        self.index = CounterIndex.from_cumulative(self.cumulative)
+
+    def test_first_crossing_matches_linear_scan(self) -> None:
+        rng = np.random.default_rng(4)
+        cumulative = np.cumsum(rng.uniform(0, 3, size=(6, 40)), axis=1)
+        index = CounterIndex.from_cumulative(cumulative)
+        thresholds = rng.uniform(-1, 130, size=(6, 9))
+
+        days = index.first_crossing_days(thresholds)
+
+        for lane in range(6):
+            for position, threshold in enumerate(thresholds[lane]):
+                above = np.flatnonzero(cumulative[lane] > threshold)
+                expected = above[0] if above.size else NO_DAY
+                self.assertEqual(days[lane, position], expected)
+
+    def test_shared_thresholds_lanes_and_edges(self) -> None:
+        np.testing.assert_array_equal(
+            self.index.first_crossing_days([0.5, 2.0, 4.0, 9.0, np.nan]),
+            [[0, 3, 3, NO_DAY, NO_DAY], [1, 1, 4, NO_DAY, NO_DAY]],
+        )
+        np.testing.assert_array_equal(
+            self.index.first_crossing_days([[4.0], [4.0], [1.0]], np.array([1, 1, 0])),
+            [[4], [4], [1]],
+        )
+        np.testing.assert_array_equal(
+            self.index.first_crossing_days([0.5, 5.0], start_day=2),
+            [[2, 4], [2, 4]],
+        )
+        with self.assertRaises(ValueError):
+            self.index.first_crossing_days(np.zeros((3, 1)))
+
+    def test_non_monotone_counters_use_running_maximum(self) -> None:
+        index = CounterIndex.from_cumulative(np.array([3.0, 1.0, 2.0, 4.0]))
+        np.testing.assert_array_equal(
+            index.first_crossing_days([0.0, 2.5, 3.0]), [[0, 0, 3]]
+        )
+        self.assertIs(self.index.running_max, self.cumulative)
+
+    def test_planned_counter_report_matches_counter_scan(self) -> None:
+        np.random.seed(5)
+        phases = {
+            "base": {
+                "after_day": 0,
+                "distribution": "normal",
+                "mean": 5,
+                "std": 3,
+                "min": 0,
+                "max": 12,
+            }
+        }
+        counter_df = build_counter_data(
+            {"num_simulations": 3, "num_days": 120, "daily_utilisations": phases}
+        )
+        parameter_config = {
+            "package_cycle": 50,
+            "items": {"replace couplings": 50, "overhaul": 100},
+            "annual_estimate": 1800,
+            "annual_estimate_recalculate_after_days": 7,
+            "early_shift_factors": 0.5,
+            "late_shift_factors": 0.5,
+            "call_horizon_days": 3,
+        }
+        reference = run_simulation(counter_df, parameter_config, export_csv=False)
+
+        report = planned_vs_actual_days(
+            reference, CounterIndex.from_counter_data(counter_df)
+        )
+        self.assertEqual(len(report), int(reference["completion"].sum()))
+        for row in report.itertuples():
+            cumulative = counter_df.loc[row.simulation, "cumulative_utilisation"]
+            above = np.flatnonzero(cumulative.to_numpy() > row.next_planned_counter)
+            self.assertEqual(row.planned_counter_day, above[0])
+            self.assertEqual(
+                row.days_after_planned_counter, row.completion_day - above[0]
+            )
+
+
+    def test_planned_counter_report_maps_chunk_simulation_ids(self) -> None:
+        utilisation = np.full((5, 40), 3.0)
+        utilisation[3] = 6.0
+        counters = np.stack([utilisation, np.cumsum(utilisation, axis=1)])
+        parameter_config = {
+            "package_cycle": 20,
+            "items": {"replace couplings": 20},
+            "annual_estimate": 1000,
+            "annual_estimate_recalculate_after_days": 7,
+            "call_horizon_days": 1,
+        }
+        chunk_df = counter_frame(counters[:, 2:5], 2)
+        chunk_results = run_simulation(chunk_df, parameter_config, export_csv=False)
+        full_results = run_simulation(
+            counter_frame(counters), parameter_config, export_csv=False
+        )
+        expected = planned_vs_actual_days(
+            full_results[full_results["simulation"] >= 2],
+            CounterIndex.from_counter_data(counter_frame(counters)),
+        )
+
+        for index in (
+            CounterIndex.from_counter_data(chunk_df),
+            CounterIndex.from_cumulative(counters[1, 2:5], np.arange(2, 5)),
+            CounterIndex.from_counter_data(counter_frame(counters)),
+        ):
+            report = planned_vs_actual_days(chunk_results, index)
+            np.testing.assert_array_equal(
+                report["planned_counter_day"].to_numpy(),
+                expected["planned_counter_day"].to_numpy(),
+            )
+        self.assertTrue((expected["simulation"] == 3).any())
+        with self.assertRaisesRegex(ValueError, "not in the counter index"):
+            planned_vs_actual_days(
+                full_results, CounterIndex.from_counter_data(chunk_df)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+
+import numpy as np
+
+from src.simulation.counters import build_fleet_counter_arrays
+from src.simulation.fleet import run_batched_simulation, run_fleet_simulation
+from src.simulation.montecarlo import build_counter_data, run_simulation
+from src.simulation.utilisation import generate_utilisation
+
+
+class FleetTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.phases = {
+            "base": {
+                "after_day": 0,
+                "distribution": "normal",
+                "mean": 5,
+                "std": 3,
+                "min": 0,
+                "max": 12,
+            },
+            "later": {"after_day": 60, "distribution": "poisson", "lambda": 4},
+        }
+        self.parameter_config = {
+            "package_cycle": 50,
+            "items": {"replace couplings": 50, "overhaul": 100, "replace pump": 200},
+            "annual_estimate": 1800,
+            "annual_estimate_recalculate_after_days": 7,
+            "suppressed": False,
+            "completion_requirement": False,
+            "early_shift_factors": 0.5,
+            "late_shift_factors": 0.5,
+            "call_horizon_days": 3,
+        }
+
+    def test_generate_utilisation_with_assets_is_three_dimensional(self) -> None:
+        utilisation = generate_utilisation(self.phases, 2, 90, num_assets=3)
+        self.assertEqual(utilisation.shape, (2, 3, 90))
+        self.assertEqual(generate_utilisation(self.phases, 2, 90).shape, (2, 90))
+
+    def test_fleet_counters_use_per_asset_phases(self) -> None:
+        constant = {
+            "base": {"after_day": 0, "distribution": "uniform", "min": 2, "max": 2}
+        }
+        config = {
+            "num_simulations": 2,
+            "num_days": 90,
+            "daily_utilisations": self.phases,
+            "assets": {"pump_a": {}, "pump_b": {"daily_utilisations": constant}},
+        }
+        names, utilisation, cumulative = build_fleet_counter_arrays(config)
+
+        self.assertEqual(names, ("pump_a", "pump_b"))
+        self.assertTrue((utilisation[:, 1, :] == 2).all())
+        np.testing.assert_array_equal(cumulative[:, 1, -1], [180, 180])
+
+    def test_batched_engine_matches_reference(self) -> None:
+        np.random.seed(3)
+        counter_df = build_counter_data(
+            {"num_simulations": 3, "num_days": 150, "daily_utilisations": self.phases}
+        )
+        for suppressed in (False, True):
+            for completion_requirement in (False, True):
+                with self.subTest(
+                    suppressed=suppressed, completion_requirement=completion_requirement
+                ):
+                    parameter_config = {
+                        **self.parameter_config,
+                        "suppressed": suppressed,
+                        "completion_requirement": completion_requirement,
+                    }
+                    expected = run_simulation(
+                        counter_df, parameter_config, export_csv=False
+                    )
+                    actual = run_batched_simulation(counter_df, parameter_config)
+
+                    self.assertEqual(list(actual.columns), list(expected.columns))
+                    self.assertEqual(list(actual["item"]), list(expected["item"]))
+                    numeric = [
+                        column for column in expected.columns if column != "item"
+                    ]
+                    np.testing.assert_array_equal(
+                        actual[numeric].to_numpy(dtype=float),
+                        expected[numeric].to_numpy(dtype=float),
+                    )
+
+    def test_run_fleet_simulation_returns_every_lane(self) -> None:
+        config = {
+            "num_simulations": 2,
+            "num_days": 120,
+            "num_assets": 4,
+            "daily_utilisations": self.phases,
+        }
+        result = run_fleet_simulation(config, self.parameter_config)
+        frame = result.to_frame()
+
+        self.assertEqual(result.work_orders.num_lanes, 8)
+        self.assertEqual(len(frame), 8 * result.work_orders.num_rows)
+        self.assertEqual(set(frame["asset"]), {f"asset_{i}" for i in range(4)})
+        self.assertEqual(set(frame["simulation"]), {0, 1})
+        self.assertTrue(frame["completion"].any())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from pathlib import Path
+
+from src.simulation.backends import BACKENDS
+from src.simulation.compact import COMPACT_COUNTER_DTYPE
+from src.simulation.golden import (
+    GOLDEN_CASES,
+    check_backend,
+    compare_work_orders,
+    load_golden_output,
+)
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+
+
+class GoldenOutputTests(unittest.TestCase):
+    def test_every_backend_matches_the_golden_outputs(self) -> None:
+        for backend in BACKENDS:
+            for case, divergence in check_backend(backend, GOLDEN_DIR).items():
+                with self.subTest(backend=backend, case=case):
+                    self.assertIsNone(divergence, msg=str(divergence))
+
+    def test_every_backend_matches_the_reference_on_compact_counters(self) -> None:
+        for backend in BACKENDS:
+            if backend == "reference":
+                continue
+            divergences = check_backend(
+                backend, GOLDEN_DIR, dtype=COMPACT_COUNTER_DTYPE
+            )
+            for case, divergence in divergences.items():
+                with self.subTest(backend=backend, case=case):
+                    self.assertIsNone(divergence, msg=str(divergence))
+
+    def test_compare_reports_first_divergent_day_and_event(self) -> None:
+        case = next(iter(GOLDEN_CASES))
+        expected = load_golden_output(GOLDEN_DIR, case)
+        completed = expected.index[expected["completion"]]
+        early, late = completed[0], completed[-1]
+
+        actual = expected.copy()
+        actual.loc[late, "completion_day"] += 1
+        actual.loc[early, "completion_counter"] += 0.5
+        actual.loc[early, "next_planned_counter"] += 1e-12
+
+        divergence = compare_work_orders(expected, actual)
+        self.assertEqual(divergence.row, early)
+        self.assertEqual(divergence.columns, ("completion_counter",))
+        self.assertEqual(divergence.event, "state")
+        self.assertIn("2 row(s) differ", str(divergence))
+
+        actual.loc[early, "call_day"] += 2
+        divergence = compare_work_orders(expected, actual)
+        self.assertEqual((divergence.row, divergence.event), (early, "call"))
+        self.assertEqual(divergence.day, expected.loc[early, "call_day"])
+        self.assertEqual(divergence.columns[0], "call_day")
+
+        self.assertIn(
+            "Columns differ",
+            str(compare_work_orders(expected, actual.drop(columns="cycle"))),
+        )
+        self.assertIsNone(compare_work_orders(expected, expected.copy()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.simulation.history import (
+    CounterStore,
+    ingest_counter_readings,
+    open_counter_store,
+)
+from src.simulation.utilisation import generate_utilisation
+
+
+def _readings() -> pd.DataFrame:
+    # pump_a: 10/day with a two-day gap; pump_b starts later and has a meter reset
+    return pd.DataFrame(
+        {
+            "asset": ["pump_a"] * 4 + ["pump_b"] * 3,
+            "date": [
+                "2024-01-01",
+                "2024-01-02",
+                "2024-01-05",
+                "2024-01-06",
+                "2024-01-03",
+                "2024-01-04",
+                "2024-01-05",
+            ],
+            "counter": [100, 110, 140, 150, 500, 520, 5],
+        }
+    )
+
+
+class HistoryTests(unittest.TestCase):
+    def test_ingest_interpolates_gaps_and_reopens_memory_mapped(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ingest_counter_readings(_readings(), Path(temp_dir) / "store")
+            store = CounterStore.open(Path(temp_dir) / "store")
+
+            self.assertEqual(store.assets, ("pump_a", "pump_b"))
+            self.assertEqual(store.start_date, "2024-01-01")
+            self.assertIsInstance(store.utilisation, np.memmap)
+            self.assertFalse(store.utilisation.flags.writeable)
+            np.testing.assert_array_equal(
+                store.asset_history("pump_a"), [10, 10, 10, 10, 10]
+            )
+            np.testing.assert_array_equal(store.asset_history("pump_b"), [20, 0])
+            self.assertTrue(
+                np.shares_memory(store.asset_history("pump_a"), store.utilisation)
+            )
+            with self.assertRaises(ValueError):
+                store.asset_history("pump_c")
+            del store
+
+    def test_history_phases_replay_bootstrap_and_mix_with_synthetic(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_path = str(Path(temp_dir) / "store")
+            days = pd.date_range("2024-01-01", periods=41, freq="D")
+            ingest_counter_readings(
+                pd.DataFrame(
+                    {
+                        "asset": "crane",
+                        "date": days,
+                        "counter": np.arange(41) ** 2,
+                    }
+                ),
+                store_path,
+            )
+            history = np.arange(1, 80, 2, dtype=float)
+            phases = {
+                "replay": {
+                    "after_day": 0,
+                    "distribution": "history",
+                    "store": store_path,
+                    "asset": "crane",
+                    "mode": "replay",
+                },
+                "bootstrap": {
+                    "after_day": 10,
+                    "distribution": "history",
+                    "store": store_path,
+                    "asset": "crane",
+                    "block_days": 5,
+                },
+                "synthetic": {
+                    "after_day": 30,
+                    "distribution": "uniform",
+                    "min": 100,
+                    "max": 200,
+                },
+            }
+            utilisation = generate_utilisation(
+                phases, 6, 40, rng=np.random.default_rng(2)
+            )
+
+        np.testing.assert_array_equal(
+            utilisation[:, :10], np.tile(history[:10], (6, 1))
+        )
+        blocks = utilisation[:, 10:30].reshape(6, 4, 5)
+        # Every bootstrap block is a contiguous run of history
+        np.testing.assert_array_equal(np.diff(blocks, axis=2), 2)
+        self.assertTrue(np.isin(blocks, history).all())
+        self.assertGreaterEqual(utilisation[:, 30:].min(), 100)
+
+    def test_reingest_replaces_store_under_open_readers(self) -> None:
+        def readings(step: int) -> pd.DataFrame:
+            days = pd.date_range("2024-01-01", periods=11, freq="D")
+            return pd.DataFrame(
+                {"asset": "crane", "date": days, "counter": np.arange(11) * step}
+            )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_path = str(Path(temp_dir) / "store")
+            phase = {
+                "after_day": 0,
+                "distribution": "history",
+                "store": store_path,
+                "asset": "crane",
+                "mode": "replay",
+            }
+            ingest_counter_readings(readings(3), store_path)
+            before = generate_utilisation({"base": phase}, 2, 10)
+            reader = CounterStore.open(store_path)
+
+            ingest_counter_readings(readings(7), store_path)
+            after = generate_utilisation({"base": phase}, 2, 10)
+
+            # The open map still sees the complete old store
+            np.testing.assert_array_equal(reader.asset_history("crane"), [3] * 10)
+            self.assertEqual(
+                sorted(path.name for path in Path(store_path).iterdir()),
+                ["meta.json", "utilisation.npy"],
+            )
+            del reader
+
+        self.assertTrue((before == 3).all())
+        # The cache is keyed on the file's mtime, so the new store is read
+        self.assertTrue((after == 7).all())
+        self.assertEqual(open_counter_store.cache_info().maxsize, 16)
+
+    def test_history_phase_validation(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_path = str(Path(temp_dir) / "store")
+            ingest_counter_readings(_readings(), store_path)
+            base = {"after_day": 0, "distribution": "history", "store": store_path}
+            for phase in (
+                base,
+                {**base, "asset": "pump_c"},
+                {**base, "asset": "pump_a", "mode": "shuffle"},
+                {**base, "asset": "pump_a", "offset": 5},
+            ):
+                with self.subTest(phase=phase), self.assertRaises(ValueError):
+                    generate_utilisation({"base": phase}, 2, 5)
+            with self.assertRaises(ValueError):
+                # Replaying more days than were recorded
+                generate_utilisation(
+                    {"base": {**base, "asset": "pump_a", "mode": "replay"}}, 2, 6
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
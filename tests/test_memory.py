@@ -0,0 +1,162 @@
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.simulation.memory import (
+    PANDAS_IMPORT_BYTES,
+    MemoryBudgetError,
+    MemoryTracker,
+    estimate_memory,
+    plan_run,
+    uses_pandas,
+)
+from src.simulation.parameters import compile_parameters
+from src.simulation.runner import plan_batch, run_batch
+
+MiB = 1024**2
+
+
+class MemoryPlanningTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = {
+            "num_simulations": 200,
+            "num_days": 365,
+            "daily_utilisations": {
+                "base": {"after_day": 0, "distribution": "uniform", "min": 5, "max": 5}
+            },
+            "parameters": {
+                "package_cycle": 20,
+                "items": {"replace couplings": 20, "overhaul": 40},
+                "annual_estimate": 1825,
+                "annual_estimate_recalculate_after_days": [7, 30],
+                "early_shift_factors": 0,
+                "late_shift_factors": 0,
+                "call_horizon_days": 1,
+            },
+        }
+        parameters = dict(self.config["parameters"])
+        parameters["annual_estimate_recalculate_after_days"] = 7
+        self.parameter_sets = [compile_parameters(parameters)]
+
+    def estimate(self, **kwargs):
+        return estimate_memory(
+            self.config, self.parameter_sets, baseline=100 * MiB, **kwargs
+        )
+
+    def test_estimate_scales_with_chunk_backend_and_compact(self) -> None:
+        small, large = self.estimate(chunk_size=10), self.estimate(chunk_size=100)
+        self.assertEqual(small.counters, large.counters)
+        self.assertEqual(large.engine, 10 * small.engine)
+        self.assertLess(small.peak_bytes, large.peak_bytes)
+        self.assertEqual(self.estimate().simulations_per_chunk, 200)
+        self.assertLess(self.estimate(backend="batched").engine, self.estimate().engine)
+        self.assertLess(
+            self.estimate(compact=True, shared_counters=True).counters,
+            self.estimate(shared_counters=True).counters,
+        )
+        self.assertEqual(self.estimate(sink_format="none").sink_buffers, 0)
+        self.assertIn("Estimated peak", large.summary())
+
+    def test_plan_lowers_chunk_then_workers_to_fit_budget(self) -> None:
+        unbounded = plan_run(
+            self.config, self.parameter_sets * 2, workers=2, baseline=100 * MiB
+        )
+        self.assertEqual((unbounded.workers, unbounded.chunk_size), (2, 200))
+        self.assertIsNone(unbounded.process_budget)
+
+        full = self.estimate(chunk_size=200).peak_bytes
+        smallest = self.estimate(chunk_size=1).peak_bytes
+        plan = plan_run(
+            self.config,
+            self.parameter_sets,
+            memory_budget=(full + smallest) // 2,
+            baseline=100 * MiB,
+        )
+        self.assertEqual(plan.workers, 1)
+        self.assertLess(plan.chunk_size, 200)
+        self.assertLessEqual(plan.main.peak_bytes, plan.process_budget)
+
+        plan = plan_run(
+            self.config,
+            self.parameter_sets * 4,
+            memory_budget=3 * full,
+            workers=4,
+            baseline=100 * MiB,
+        )
+        self.assertEqual(plan.workers, 2)
+        self.assertLessEqual(plan.worker.peak_bytes, plan.process_budget)
+        # Workers split what the resident main process leaves of the budget
+        self.assertEqual(plan.process_budget, (3 * full - plan.main.peak_bytes) // 2)
+        self.assertLessEqual(
+            plan.main.peak_bytes + plan.workers * plan.process_budget, 3 * full
+        )
+
+        with self.assertRaises(MemoryBudgetError) as caught:
+            plan_run(self.config, self.parameter_sets, memory_budget=1 * MiB)
+        self.assertIn("Estimated peak", str(caught.exception))
+
+    def test_run_refuses_to_start_over_budget_and_reports_phases(self) -> None:
+        with tempfile.TemporaryDirectory() as output_dir:
+            with self.assertRaises(MemoryBudgetError):
+                run_batch(self.config, output_dir, memory_budget=1 * MiB)
+            self.assertEqual(list(Path(output_dir).iterdir()), [])
+
+            small = dict(self.config, num_simulations=3, num_days=60)
+            plan = plan_batch(small, sweep=True, backend="batched")
+            stats = run_batch(
+                small, output_dir, seed=1, sweep=True, backend="batched"
+            )
+            self.assertEqual(stats.plan.chunk_size, plan.chunk_size)
+            self.assertEqual(
+                [phase.name for phase in stats.memory_phases],
+                ["counters", "parameter set 0", "parameter set 1"],
+            )
+            self.assertIn("Memory by phase", stats.summary())
+
+    def test_accepted_plan_holds_when_pandas_is_imported_lazily(self) -> None:
+        self.assertTrue(uses_pandas(self.config, "batched", "csv"))
+        self.assertTrue(uses_pandas(self.config, "reference", "none"))
+        self.assertFalse(uses_pandas(self.config, "batched", "none"))
+        # The reference engine and the csv sink import pandas only once running,
+        # so a fresh process plans for the import before measuring anything
+        probe = "\n".join(
+            [
+                "import json, sys, tempfile",
+                "from src.simulation.runner import plan_batch, run_batch",
+                "config = json.loads(sys.argv[1])",
+                "plan = plan_batch(config, sweep=True)",
+                "# Leave room for the baseline drifting before run_batch plans again",
+                "budget = plan.main.peak_bytes + 2 * 1024**2",
+                "with tempfile.TemporaryDirectory() as output_dir:",
+                "    run_batch(config, output_dir, seed=1, sweep=True,",
+                "              memory_budget=budget)",
+                "print(plan.main.imports)",
+            ]
+        )
+        small = dict(self.config, num_simulations=3, num_days=60)
+        output = subprocess.run(
+            [sys.executable, "-c", probe, json.dumps(small)],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(output.returncode, 0, output.stderr)
+        self.assertEqual(output.stdout.strip(), str(PANDAS_IMPORT_BYTES))
+
+    def test_tracker_reports_allocation_peaks_when_tracing(self) -> None:
+        tracker = MemoryTracker(trace_allocations=True)
+        with tracker.phase("allocate"):
+            block = bytearray(4 * MiB)
+        del block
+        with MemoryTracker().phase("untraced"):
+            pass
+        (phase,) = tracker.phases
+        self.assertGreaterEqual(phase.allocated_peak_bytes, 4 * MiB)
+        self.assertIn("allocated peak", tracker.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ from src.simulation.montecarlo import (
     build_work_order_schedule,
     run_simulation,
 )
+from src.simulation.parameters import compile_parameters
 
 
 class MonteCarloTests(unittest.TestCase):
@@ -25,10 +26,9 @@ class MonteCarloTests(unittest.TestCase):
 
         self.assertFalse(schedule_df.empty)
         self.assertIn("call_counter", schedule_df.columns)
-        self.assertIn("annual_estimate_recalculate_after_days", schedule_df.columns)
-        self.assertEqual(
-            int(schedule_df["annual_estimate_recalculate_after_days"].iloc[0]), 30
-        )
+        self.assertNotIn("annual_estimate_recalculate_after_days", schedule_df.columns)
+        self.assertNotIn("suppressed", schedule_df.columns)
+        self.assertEqual(compile_parameters(parameter_config).recalc_days, 30)
 
     def test_build_work_order_schedule_suppressed(self) -> None:
         parameter_config = {
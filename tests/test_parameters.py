@@ -0,0 +1,58 @@
+import unittest
+
+from src.simulation.montecarlo import build_counter_data
+from src.simulation.parameters import ParameterSet, compile_parameters
+
+
+class ParameterSetTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.parameter_config = {
+            "package_cycle": 2000,
+            "items": {"replace couplings": 2000, "overhaul": 8000},
+            "annual_estimate": 5000,
+            "annual_estimate_recalculate_after_days": 30,
+            "suppressed": True,
+            "completion_requirement": False,
+            "early_shift_factors": 0.5,
+            "late_shift_factors": 0,
+            "call_horizon_days": 30,
+        }
+
+    def test_compile_parameters_is_frozen_and_hashable(self) -> None:
+        params = compile_parameters(self.parameter_config)
+
+        self.assertIsInstance(params, ParameterSet)
+        self.assertEqual(params.recalc_days, 30)
+        self.assertEqual(params.early_shift, 0.5)
+        self.assertEqual(params.units_prior_for_call, round(5000 / 365 * 30, 0))
+        self.assertIs(compile_parameters(params), params)
+        self.assertEqual(hash(params), hash(compile_parameters(self.parameter_config)))
+        with self.assertRaises(AttributeError):
+            params.suppressed = False
+
+    def test_compile_parameters_rejects_bad_values(self) -> None:
+        for key, value in (
+            ("call_horizon_days", [30, 60]),
+            ("call_horizon_days", -1),
+            ("late_shift_factors", "high"),
+            ("items", {"overhaul": 0}),
+        ):
+            with self.subTest(key=key, value=value):
+                with self.assertRaises(ValueError):
+                    compile_parameters({**self.parameter_config, key: value})
+
+    def test_unsorted_phases_fail_before_compute(self) -> None:
+        config = {
+            "num_simulations": 2,
+            "num_days": 10,
+            "daily_utilisations": {
+                "late": {"after_day": 5, "distribution": "poisson", "lambda": 3},
+                "early": {"after_day": 0, "distribution": "poisson", "lambda": 3},
+            },
+        }
+        with self.assertRaises(ValueError):
+            build_counter_data(config)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.cli import main as cli_main
+from src.simulation.runner import run_batch, select_parameter_sets
+
+
+class BatchRunnerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = {
+            "num_simulations": 3,
+            "num_days": 60,
+            "daily_utilisations": {
+                "base": {
+                    "after_day": 0,
+                    "distribution": "uniform",
+                    "min": 5,
+                    "max": 5,
+                }
+            },
+            "parameters": {
+                "package_cycle": 20,
+                "items": {"replace couplings": 20, "overhaul": 40},
+                "annual_estimate": 365,
+                "annual_estimate_recalculate_after_days": [7, 30],
+                "suppressed": False,
+                "completion_requirement": False,
+                "early_shift_factors": 0,
+                "late_shift_factors": 0,
+                "call_horizon_days": 1,
+            },
+        }
+
+    def test_select_parameter_sets_defaults_to_first_combination(self) -> None:
+        parameters = self.config["parameters"]
+        self.assertEqual([i for i, _ in select_parameter_sets(parameters)], [0])
+        self.assertEqual(
+            [i for i, _ in select_parameter_sets(parameters, sweep=True)], [0, 1]
+        )
+
+    def test_run_batch_writes_chunks_and_resumes(self) -> None:
+        with tempfile.TemporaryDirectory() as output_dir:
+            stats = run_batch(self.config, output_dir, seed=3, sweep=True, chunk_size=2)
+            self.assertEqual(stats.parameter_sets, 2)
+            self.assertEqual(stats.simulations, 6)
+            self.assertGreater(stats.events, 0)
+
+            set_dir = Path(output_dir) / "parameter_set_0001"
+            parts = sorted(set_dir.glob("part-*.csv"))
+            self.assertEqual(len(parts), 2)
+            self.assertTrue((set_dir / "_SUCCESS").exists())
+            written = pd.concat(pd.read_csv(part) for part in parts)
+            self.assertEqual(len(written), stats.rows // 2)
+            self.assertEqual(set(written["simulation"]), {0, 1, 2})
+
+            resumed = run_batch(
+                self.config, output_dir, seed=3, sweep=True, resume=True
+            )
+            self.assertEqual(resumed.parameter_sets, 0)
+            self.assertEqual(resumed.skipped, 2)
+
+    def test_resume_refuses_a_different_run(self) -> None:
+        with tempfile.TemporaryDirectory() as output_dir:
+            run_batch(self.config, output_dir, seed=3, sweep=True)
+
+            for options, reason in (
+                ({"seed": None}, "needs a seed"),
+                ({"seed": 4}, "seed"),
+                ({"compact": True}, "compact"),
+                ({"sweep": False, "sample": 1}, "parameter_sets"),
+            ):
+                arguments = {"seed": 3, "sweep": True, **options}
+                with self.subTest(options=options):
+                    with self.assertRaisesRegex(ValueError, reason):
+                        run_batch(self.config, output_dir, resume=True, **arguments)
+            changed = {**self.config, "num_days": 90}
+            with self.assertRaisesRegex(ValueError, "config"):
+                run_batch(changed, output_dir, seed=3, sweep=True, resume=True)
+
+            config_path = Path(output_dir) / "config.json"
+            config_path.write_text(json.dumps(self.config), encoding="utf-8")
+            arguments = ["--config", str(config_path), "--output-dir", output_dir]
+            self.assertEqual(cli_main(arguments + ["--sweep", "--resume"]), 2)
+
+            (Path(output_dir) / "run.json").unlink()
+            with self.assertRaisesRegex(ValueError, "no run.json"):
+                run_batch(self.config, output_dir, seed=3, sweep=True, resume=True)
+
+    def test_cli_reports_invalid_config(self) -> None:
+        with tempfile.TemporaryDirectory() as output_dir:
+            missing = str(Path(output_dir) / "missing.json")
+            self.assertEqual(
+                cli_main(["--config", missing, "--output-dir", output_dir]), 2
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
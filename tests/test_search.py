@@ -0,0 +1,70 @@
+import unittest
+
+from src.simulation.montecarlo import build_counter_data, run_simulation
+from src.simulation.results import simulation_kpis
+from src.simulation.search import successive_halving
+
+
+class SuccessiveHalvingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        config = {
+            "num_simulations": 4,
+            "num_days": 60,
+            "daily_utilisations": {
+                "base": {
+                    "after_day": 0,
+                    "distribution": "uniform",
+                    "min": 5,
+                    "max": 5,
+                }
+            },
+        }
+        self.counter_df = build_counter_data(config)
+        base = {
+            "package_cycle": 20,
+            "items": {"replace couplings": 20, "overhaul": 40},
+            "annual_estimate": 365,
+            "annual_estimate_recalculate_after_days": 7,
+            "suppressed": False,
+            "completion_requirement": False,
+            "early_shift_factors": 0,
+            "late_shift_factors": 0,
+        }
+        self.candidates = [
+            {**base, "call_horizon_days": horizon} for horizon in (1, 3, 6, 10)
+        ]
+
+    def test_simulation_kpis_one_row_per_simulation(self) -> None:
+        result_df = run_simulation(
+            self.counter_df, self.candidates[0], export_csv=False
+        )
+        kpis = simulation_kpis(result_df)
+        self.assertEqual(list(kpis.index), [0, 1, 2, 3])
+        self.assertTrue((kpis["completed"] > 0).all())
+
+    def test_successive_halving_grows_budget_and_picks_best(self) -> None:
+        result = successive_halving(
+            self.counter_df,
+            self.candidates,
+            objective="mean_abs_counter_variance",
+            min_simulations=1,
+            eta=2,
+        )
+
+        budgets = [round_.num_simulations for round_ in result.rounds]
+        survivors = [len(round_.scores) for round_ in result.rounds]
+        self.assertEqual(budgets, [1, 2, 4])
+        self.assertEqual(survivors, [4, 2, 1])
+
+        first_scores = result.rounds[0].scores
+        expected = min(first_scores, key=first_scores.get)
+        self.assertEqual(result.best_index, expected)
+        self.assertEqual(result.best_config, self.candidates[expected])
+
+    def test_successive_halving_rejects_unknown_objective(self) -> None:
+        with self.assertRaises(ValueError):
+            successive_halving(self.counter_df, self.candidates, objective="speed")
+
+
+if __name__ == "__main__":
+    unittest.main()
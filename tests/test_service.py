@@ -0,0 +1,182 @@
+import asyncio
+import json
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.server import handle_connection
+from src.simulation.common_random import run_common_random_sweep
+from src.simulation.montecarlo import build_counter_data
+from src.simulation.runner import select_parameter_sets
+from src.simulation.service import SimulationService
+
+
+class SimulationServiceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = {
+            "num_simulations": 4,
+            "num_days": 60,
+            "daily_utilisations": {
+                "base": {
+                    "after_day": 0,
+                    "distribution": "uniform",
+                    "min": 3,
+                    "max": 7,
+                }
+            },
+            "parameters": {
+                "package_cycle": 20,
+                "items": {"replace couplings": 20, "overhaul": 40},
+                "annual_estimate": 365,
+                "annual_estimate_recalculate_after_days": [7, 30],
+                "suppressed": False,
+                "completion_requirement": False,
+                "early_shift_factors": 0,
+                "late_shift_factors": 0,
+                "call_horizon_days": 1,
+            },
+        }
+
+    def test_sweep_streams_partials_and_dedupes_through_the_cache(self) -> None:
+        async def scenario():
+            async with SimulationService(workers=2, chunk_size=1) as service:
+                sweep = service.submit(self.config, kind="sweep", seed=5)
+                self.assertIs(service.submit(self.config, kind="sweep", seed=5), sweep)
+                snapshots = [s async for s in service.watch(sweep.job_id)]
+
+                run = service.submit(self.config, kind="run", seed=5)
+                await service.wait(run.job_id)
+                unseeded = service.submit(self.config, kind="run")
+                await service.wait(unseeded.job_id)
+                return sweep, run, unseeded, snapshots
+
+        sweep, run, unseeded, snapshots = asyncio.run(scenario())
+
+        self.assertEqual(sweep.status, "done")
+        self.assertEqual(snapshots[-1]["status"], "done")
+        progress = [s["completed_simulations"] for s in snapshots]
+        self.assertEqual(progress, sorted(progress))
+        self.assertEqual(progress[-1], 8)
+        self.assertTrue(any(0 < done < 8 for done in progress))
+
+        expected = run_common_random_sweep(
+            build_counter_data(self.config, rng=np.random.default_rng(5)),
+            [cfg for _, cfg in select_parameter_sets(self.config["parameters"], True)],
+        )
+        pd.testing.assert_frame_equal(
+            sweep.result().astype(float), expected.astype(float)
+        )
+        self.assertEqual(set(snapshots[-1]["aggregates"]), {"0", "1"})
+
+        self.assertEqual((run.status, run.cached), ("done", 1))
+        pd.testing.assert_frame_equal(run.result(), sweep.result().loc[[0]])
+        self.assertEqual((unseeded.status, unseeded.cached), ("done", 0))
+
+    def test_finished_jobs_results_and_counter_files_are_evicted(self) -> None:
+        async def scenario():
+            async with SimulationService(
+                max_finished_jobs=1, max_cached_results=1, max_counter_files=1
+            ) as service:
+                first = service.submit(self.config, seed=1)
+                await service.wait(first.job_id)
+                counter_dir = Path(service._temp_dir.name)
+                first_files = set(counter_dir.iterdir())
+
+                second = service.submit(self.config, seed=2)
+                await service.wait(second.job_id)
+
+                self.assertEqual(list(service.jobs), [second.job_id])
+                with self.assertRaises(ValueError):
+                    service.get(first.job_id)
+                self.assertEqual(len(service._results), 1)
+                second_files = set(counter_dir.iterdir())
+                self.assertEqual(len(second_files), 1)
+                self.assertFalse(first_files & second_files)
+
+                again = service.submit(self.config, seed=1)
+                self.assertIsNot(again, first)
+                await service.wait(again.job_id)
+                return first, again
+
+        first, again = asyncio.run(scenario())
+        pd.testing.assert_frame_equal(again.result(), first.result())
+        self.assertEqual(again.cached, 0)
+
+    def test_invalid_jobs_are_rejected_before_scheduling(self) -> None:
+        async def scenario():
+            async with SimulationService() as service:
+                for kwargs in (
+                    {"kind": "replay"},
+                    {"config": {**self.config, "num_assets": 2}},
+                    {"config": {**self.config, "parameters": {"items": {"x": -1}}}},
+                    {"config": "x"},
+                    {"config": {**self.config, "parameters": [1]}},
+                    {"config": {**self.config, "parameters": {"items": [1]}}},
+                    {"config": {**self.config, "daily_utilisations": {"base": 1}}},
+                    {"config": {**self.config, "num_days": "60"}},
+                    {"seed": "abc"},
+                    {"sample": "3"},
+                    {"sample": True},
+                ):
+                    with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                        service.submit(**{"config": self.config, **kwargs})
+                self.assertEqual(service.jobs, {})
+
+        asyncio.run(scenario())
+
+    def test_http_front_end_submits_and_streams_jobs(self) -> None:
+        async def request(port: int, method: str, path: str, body=None) -> bytes:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            payload = json.dumps(body).encode() if body is not None else b""
+            writer.write(
+                f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+
+        async def scenario():
+            async with SimulationService() as service:
+                server = await asyncio.start_server(
+                    lambda r, w: handle_connection(service, r, w), "127.0.0.1", 0
+                )
+                port = server.sockets[0].getsockname()[1]
+                async with server:
+                    submitted = await request(
+                        port, "POST", "/jobs", {"config": self.config, "seed": 1}
+                    )
+                    job_id = json.loads(submitted.split(b"\r\n\r\n", 1)[1])["job_id"]
+                    streamed = await request(port, "GET", f"/jobs/{job_id}/stream")
+                    missing = await request(port, "GET", "/jobs/nope")
+                    invalid = [
+                        await request(port, "POST", "/jobs", body)
+                        for body in (
+                            {},
+                            {"config": "x"},
+                            {"config": self.config, "sample": "3"},
+                            {"config": {**self.config, "parameters": [1]}},
+                            {"config": self.config, "seed": "abc"},
+                            {"config_path": 3},
+                        )
+                    ]
+                return submitted, streamed, missing, invalid, service.jobs
+
+        submitted, streamed, missing, invalid, jobs = asyncio.run(scenario())
+
+        self.assertTrue(submitted.startswith(b"HTTP/1.1 202"))
+        lines = streamed.split(b"\r\n\r\n", 1)[1].splitlines()
+        final = json.loads(lines[-1])
+        self.assertEqual(final["status"], "done")
+        self.assertEqual(final["aggregates"]["0"]["simulations"], 4)
+        self.assertTrue(missing.startswith(b"HTTP/1.1 404"))
+        for response in invalid:
+            self.assertTrue(response.startswith(b"HTTP/1.1 400"), response)
+        self.assertEqual(len(jobs), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,12 @@
+import subprocess
+import sys
 import unittest
+from pathlib import Path
 
-from src.simulation.config_loader import generate_parameter_combinations
+from src.simulation.config_loader import (
+    generate_parameter_combinations,
+    generate_parameter_grid,
+)
 from src.simulation.montecarlo import build_counter_data
 
 
@@ -15,6 +21,36 @@ class SmokeTests(unittest.TestCase):
         self.assertEqual(len(combos), 4)
         self.assertTrue(all(combo["c"] == 10 for combo in combos))
 
+    def test_parameter_grid_matches_materialised_combinations(self) -> None:
+        params = {
+            "a": [1, 2, 3],
+            "b": ["x", "y"],
+            "c": 10,
+        }
+        grid = generate_parameter_grid(params)
+        combos = generate_parameter_combinations(params)
+        self.assertEqual(len(grid), len(combos))
+        self.assertEqual([grid[i] for i in range(len(grid))], combos)
+        self.assertEqual(grid[-1], combos[-1])
+        with self.assertRaises(IndexError):
+            grid[len(grid)]
+
+    def test_parameter_grid_sampling_is_bounded_and_seeded(self) -> None:
+        params = {f"k{i}": list(range(10)) for i in range(9)}
+        grid = generate_parameter_grid(params)
+        self.assertEqual(len(grid), 10**9)
+
+        for method in ("random", "latin_hypercube", "sobol"):
+            ids = grid.sample(16, method=method, seed=7)
+            self.assertEqual(ids, grid.sample(16, method=method, seed=7))
+            self.assertLessEqual(len(ids), 16)
+            self.assertEqual(len(set(ids)), len(ids))
+            self.assertTrue(all(0 <= i < len(grid) for i in ids))
+
+        lhs_ids = grid.sample(10, method="latin_hypercube", seed=1)
+        first_key_values = {grid[i]["k0"] for i in lhs_ids}
+        self.assertEqual(first_key_values, set(range(10)))
+
     def test_build_counter_data_shape(self) -> None:
         config = {
             "num_simulations": 2,
@@ -32,6 +68,58 @@ class SmokeTests(unittest.TestCase):
         self.assertEqual(len(df), 10)
         self.assertIn("cumulative_utilisation", df.columns)
 
+    def test_headless_imports_skip_heavy_modules(self) -> None:
+        probe = (
+            "import sys; import main; import src.simulation.counters; "
+            "print('matplotlib' in sys.modules)"
+        )
+        root = Path(__file__).resolve().parent.parent
+        output = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        self.assertEqual(output, "False")
+
+        probe = (
+            "import sys; import src.simulation.counters; print('pandas' in sys.modules)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        self.assertEqual(output, "False")
+
+    def test_batched_run_without_sink_skips_pandas(self) -> None:
+        probe = "\n".join(
+            [
+                "import sys, tempfile",
+                "from src.simulation.runner import run_batch",
+                "phase = {'after_day': 0, 'distribution': 'uniform', 'min': 5, 'max': 5}",
+                "config = {'num_simulations': 4, 'num_days': 60,",
+                "          'daily_utilisations': {'base': phase},",
+                "          'parameters': {'package_cycle': 20, 'items': {'a': 20},",
+                "                         'annual_estimate': 365}}",
+                "with tempfile.TemporaryDirectory() as output_dir:",
+                "    stats = run_batch(config, output_dir, workers=2,",
+                "                      backend='batched', sink_format='none')",
+                "print(stats.rows > 0, 'pandas' in sys.modules)",
+            ]
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        self.assertEqual(output, "True False")
+
 
 if __name__ == "__main__":
     unittest.main()
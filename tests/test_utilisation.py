@@ -0,0 +1,134 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.simulation.distributions import (
+    DISTRIBUTIONS,
+    open_empirical_samples,
+    register_distribution,
+)
+from src.simulation.parameters import compile_utilisation_phases
+from src.simulation.utilisation import generate_utilisation
+
+
+class UtilisationTests(unittest.TestCase):
+    def test_registered_distributions_respect_bounds_and_seed(self) -> None:
+        phases = {
+            "lognormal": {
+                "after_day": 0,
+                "distribution": "lognormal",
+                "mean": 2,
+                "sigma": 0.5,
+                "max": 24,
+            },
+            "gamma": {
+                "after_day": 20,
+                "distribution": "gamma",
+                "shape": 4,
+                "scale": 2,
+                "min": 1,
+            },
+            "triangular": {
+                "after_day": 40,
+                "distribution": "triangular",
+                "left": 2,
+                "mode": 8,
+                "right": 10,
+            },
+        }
+        first = generate_utilisation(phases, 50, 60, rng=np.random.default_rng(4))
+        second = generate_utilisation(phases, 50, 60, rng=np.random.default_rng(4))
+
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(first.shape, (50, 60))
+        self.assertLessEqual(first[:, :20].max(), 24)
+        self.assertGreaterEqual(first[:, 20:40].min(), 1)
+        triangular = first[:, 40:]
+        self.assertTrue(((triangular >= 2) & (triangular <= 10)).all())
+        self.assertAlmostEqual(triangular.mean(), (2 + 8 + 10) / 3, delta=0.3)
+        np.testing.assert_array_equal(first, np.round(first, 2))
+
+    def test_empirical_phase_bootstraps_history(self) -> None:
+        history = [0.0, 4.5, 12.25, 20.0]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "history.csv"
+            path.write_text("\n".join(str(value) for value in history))
+            phases = {
+                "inline": {
+                    "after_day": 0,
+                    "distribution": "empirical",
+                    "samples": history,
+                },
+                "file": {
+                    "after_day": 30,
+                    "distribution": "empirical",
+                    "path": str(path),
+                },
+            }
+            utilisation = generate_utilisation(
+                phases, 10, 60, rng=np.random.default_rng(1)
+            )
+            compiled = compile_utilisation_phases(phases, 60)
+
+        self.assertTrue(np.isin(utilisation, history).all())
+        self.assertEqual(set(np.unique(utilisation)), set(history))
+        self.assertTrue(utilisation.flags.c_contiguous)
+        # Phases keep hashable keys; the samples are cached read-only arrays
+        hash(compiled)
+        file_params = dict(compiled[1].params)
+        cached = open_empirical_samples(file_params["path"], file_params["mtime_ns"])
+        np.testing.assert_array_equal(cached, history)
+        self.assertFalse(cached.flags.writeable)
+        inline = dict(compiled[0].params)["samples"]
+        np.testing.assert_array_equal(inline.values, history)
+        self.assertFalse(inline.values.flags.writeable)
+        # Recompiling yields an equal phase; nothing is kept in a module cache
+        recompiled = compile_utilisation_phases({"inline": phases["inline"]}, 60)
+        self.assertEqual(recompiled[0], compiled[0])
+        self.assertEqual(hash(recompiled[0]), hash(compiled[0]))
+
+    def test_custom_distribution_can_be_registered(self) -> None:
+        @register_distribution("constant_test", ("value",))
+        def _constant(params, rng, out) -> None:
+            out.fill(params["value"])
+
+        try:
+            utilisation = generate_utilisation(
+                {"base": {"after_day": 0, "distribution": "constant_test", "value": 3}},
+                2,
+                5,
+            )
+            self.assertTrue((utilisation == 3).all())
+        finally:
+            del DISTRIBUTIONS["constant_test"]
+
+    def test_out_of_range_distribution_params_are_rejected(self) -> None:
+        invalid = {
+            "normal": {"mean": 5, "std": -1},
+            "lognormal": {"mean": 1, "sigma": -0.5},
+            "gamma": {"shape": 0, "scale": 1},
+            "poisson": {"lambda": -2},
+        }
+        invalid_scale = {"distribution": "gamma", "shape": 2, "scale": -1}
+        for distribution, params in invalid.items():
+            phases = {"base": {"after_day": 0, "distribution": distribution, **params}}
+            with self.subTest(distribution=distribution):
+                with self.assertRaisesRegex(ValueError, "must be"):
+                    compile_utilisation_phases(phases, 5)
+        with self.assertRaisesRegex(ValueError, "'scale' must be >= 0"):
+            compile_utilisation_phases({"base": {"after_day": 0, **invalid_scale}}, 5)
+
+        zero = {"after_day": 0, "distribution": "poisson", "lambda": 0}
+        self.assertTrue((generate_utilisation({"base": zero}, 2, 5) == 0).all())
+
+    def test_unknown_distribution_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            generate_utilisation(
+                {"base": {"after_day": 0, "distribution": "weibull"}}, 2, 5
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()